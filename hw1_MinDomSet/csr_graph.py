@@ -0,0 +1,265 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Compact CSR graph backend for the dominating set experiment
+
+import numpy as np
+import networkx as nx
+import itertools
+import gzip
+
+CSR_MAGIC = b"CSRGRAPH"  # 二进制 CSR 文件头: 魔数 + n + 2m + 邻居下标字节数 + 是否带 labels, 共 40 字节
+
+def sorted_unique(keys):
+    '''
+    排序并去重, 对大整数数组比 np.unique 快
+    '''
+    keys = np.sort(keys)
+    if len(keys):
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return keys
+
+class CSRGraph():
+    def __init__(self, indptr, indices, labels=None):
+        '''
+        压缩稀疏行 (CSR) 存储的无向图
+        indptr: 长度 n+1, 节点 i 的邻居为 indices[indptr[i]:indptr[i+1]]
+        indices: 长度 2m, 每条边正反各存一次
+        labels: 可选, 节点在原始文件中的编号
+        '''
+        self.indptr = indptr
+        self.indices = indices
+        self.labels = labels
+        self.n = len(indptr) - 1
+        self.degree = np.diff(indptr)  # 度数组
+
+    @classmethod
+    def from_edges(cls, n, u, v):
+        '''
+        由边数组 (u[k], v[k]) 构造, 自动去除自环与重边
+        '''
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        keep = u != v
+        a = np.minimum(u[keep], v[keep])
+        b = np.maximum(u[keep], v[keep])
+        key = sorted_unique(a * n + b)  # 去重
+        key = np.sort(np.concatenate((key, key % n * n + key // n)))  # 正反各存一次, 按 (起点, 终点) 排序
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        indices = (key % n).astype(dtype)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key // n, minlength=n), out=indptr[1:])
+        return cls(indptr, indices)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        '''
+        由 networkx 图构造, 节点不是 0..n-1 时重新编号
+        '''
+        if set(graph.nodes) != set(range(graph.number_of_nodes())):
+            graph = nx.convert_node_labels_to_integers(graph, ordering="sorted")
+        edges = np.array(list(graph.edges), dtype=np.int64).reshape(-1, 2)
+        return cls.from_edges(graph.number_of_nodes(), edges[:, 0], edges[:, 1])
+
+    def to_networkx(self):
+        '''
+        转换为 networkx 图, 仅用于画图
+        '''
+        G = nx.Graph()
+        G.add_nodes_from(range(self.n))
+        src = np.repeat(np.arange(self.n), self.degree)
+        upper = src < self.indices
+        G.add_edges_from(zip(src[upper].tolist(), self.indices[upper].tolist()))
+        return G
+
+    @classmethod
+    def load(cls, path):
+        '''
+        内存映射读取二进制 CSR 文件, 不解析、不拷贝, 重复运行可立即开始
+        '''
+        header = np.fromfile(path, dtype=np.uint8, count=40)
+        if header[:8].tobytes() != CSR_MAGIC:
+            raise ValueError("Not a CSR graph file: " + str(path))
+        n, nnz, itemsize, has_labels = header[8:].view(np.int64).tolist()
+        indptr = np.memmap(path, dtype=np.int64, mode="r", offset=40, shape=(n + 1,))
+        offset = 40 + 8 * (n + 1)
+        indices = np.memmap(path, dtype=np.dtype("int%d" % (8 * itemsize)), mode="r", offset=offset, shape=(nnz,))
+        labels = None
+        if has_labels:  # 原始编号存放在 indices 之后
+            labels = np.memmap(path, dtype=np.int64, mode="r", offset=offset + itemsize * nnz, shape=(n,))
+        return cls(indptr, indices, labels)
+
+    def save(self, path):
+        '''
+        保存为二进制 CSR 文件, 可由 CSRGraph.load 内存映射读取; 有 labels 时一并保存
+        '''
+        with open(path, "wb") as f:
+            f.write(CSR_MAGIC)
+            np.array([self.n, len(self.indices), self.indices.dtype.itemsize, self.labels is not None],
+                     dtype=np.int64).tofile(f)
+            np.asarray(self.indptr, dtype=np.int64).tofile(f)
+            np.asarray(self.indices).tofile(f)
+            if self.labels is not None:
+                np.asarray(self.labels, dtype=np.int64).tofile(f)
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def neighbors(self, i):
+        '''
+        节点 i 的邻居列表
+        '''
+        return self.indices[self.indptr[i]:self.indptr[i + 1]].tolist()
+
+    def is_dominating_set(self, nodes):
+        '''
+        O(n+m) 向量化验证 nodes 是否为支配集
+        '''
+        chosen = np.zeros(self.n, dtype=bool)
+        chosen[np.asarray(nodes, dtype=np.int64)] = True
+        # 每个点邻居中被选中的个数 = 前缀和之差
+        prefix = np.zeros(len(self.indices) + 1, dtype=np.int64)
+        np.cumsum(chosen[self.indices], out=prefix[1:])
+        chosen_neighbors = prefix[self.indptr[1:]] - prefix[self.indptr[:-1]]
+        return bool(np.all(chosen | (chosen_neighbors > 0)))
+
+    def repair_min_degree(self, delta, rng):
+        '''
+        为度数不足 delta 的点随机连接非邻居, 返回新图
+        '''
+        degree = self.degree.copy()
+        extra = {}  # 新增的邻接关系, 只记录被修改过的点
+        new_u, new_v = [], []
+        for i in np.flatnonzero(degree < delta).tolist():
+            if degree[i] >= delta:  # 之前的补边可能已经满足
+                continue
+            adj = set(self.neighbors(i)) | extra.get(i, set())
+            adj.add(i)
+            need = delta - degree[i]
+            if len(adj) + need > self.n // 2:  # 稠密时直接在补集中抽样
+                remaining = np.setdiff1d(np.arange(self.n), np.fromiter(adj, dtype=np.int64))
+                targets = rng.choice(remaining, need, replace=False).tolist()
+            else:  # 稀疏时拒绝采样
+                targets = []
+                while len(targets) < need:
+                    j = int(rng.integers(self.n))
+                    if j not in adj:
+                        adj.add(j)
+                        targets.append(j)
+            for j in targets:
+                extra.setdefault(i, set()).add(j)
+                extra.setdefault(j, set()).add(i)
+                degree[i] += 1
+                degree[j] += 1
+                new_u.append(i)
+                new_v.append(j)
+        if not new_u:
+            return self
+        src = np.repeat(np.arange(self.n), self.degree)
+        return CSRGraph.from_edges(self.n,
+                                   np.concatenate((src, new_u)),
+                                   np.concatenate((self.indices, new_v)))
+
+
+def load_edge_list(path, relabel=False, chunk_lines=1 << 20):
+    '''
+    分块流式读取边列表, 文件名以 .gz 结尾时按 gzip 解压
+    每行前两列为端点编号, "#" 或 "%" 开头的行为注释
+    relabel: 节点编号不连续时压缩为 0..n-1, 原编号保存在 labels 中
+    '''
+    opener = gzip.open if str(path).endswith(".gz") else open
+    u, v = [], []
+    with opener(path, "rt") as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_lines))
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip() and not line.lstrip().startswith(("#", "%"))]
+            if not lines:  # 整块都是注释, 跳过以免 np.loadtxt 警告无数据
+                continue
+            chunk = np.loadtxt(lines, dtype=np.int64, comments=("#", "%"), usecols=(0, 1), ndmin=2)
+            u.append(chunk[:, 0])
+            v.append(chunk[:, 1])
+    u = np.concatenate(u) if u else np.zeros(0, dtype=np.int64)
+    v = np.concatenate(v) if v else np.zeros(0, dtype=np.int64)
+    if relabel:
+        labels = sorted_unique(np.concatenate((u, v)))
+        graph = CSRGraph.from_edges(len(labels), np.searchsorted(labels, u), np.searchsorted(labels, v))
+        graph.labels = labels
+        return graph
+    n = int(max(u.max(initial=-1), v.max(initial=-1))) + 1
+    return CSRGraph.from_edges(n, u, v)
+
+
+def random_csr_graph(n, delta, p, rng):
+    '''
+    逐行生成 G(n,p), 再修复最小度约束
+    '''
+    if p >= 1 or delta >= n - 1:
+        u, v = np.triu_indices(n, 1)
+        return CSRGraph.from_edges(n, u, v)
+    src, dst = [], []
+    for i in range(n - 1):
+        targets = np.flatnonzero(rng.random(n - i - 1) < p) + i + 1  # 按概率连接 j > i
+        src.append(np.full(len(targets), i, dtype=np.int64))
+        dst.append(targets)
+    graph = CSRGraph.from_edges(n, np.concatenate(src), np.concatenate(dst))
+    return graph.repair_min_degree(delta, rng)
+
+
+def fast_gnp_edges(n, p, rng):
+    '''
+    几何跳跃采样 (Batagelj-Brandes) 生成 G(n,p) 的边, 复杂度 O(n+m)
+    把所有点对 (w, v), w < v 按 k = v(v-1)/2 + w 线性编号, 相邻两条边的编号差服从几何分布
+    '''
+    total = n * (n - 1) // 2
+    if p <= 0 or total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    chunk = min(total, int(total * p * 1.05) + 1024)  # 每批采样的跳跃数
+    found = []
+    position = -1
+    while True:
+        index = position + np.cumsum(rng.geometric(p, size=chunk))
+        found.append(index[index < total])
+        if index[-1] >= total:
+            break
+        position = index[-1]
+    k = np.concatenate(found)
+    # 线性编号还原为点对, 浮点开方后做整数修正
+    v = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    v -= v * (v - 1) // 2 > k
+    v += (v + 1) * v // 2 <= k
+    w = k - v * (v - 1) // 2
+    return w, v
+
+def repair_min_degree_edges(n, u, v, delta, rng, max_rounds=64):
+    '''
+    批量修复最小度约束: 每轮为所有缺度的点同时随机抽取邻居, 去掉自环与重边后合并
+    返回修复后的边数组
+    '''
+    if delta >= n - 1:  # 只能是完全图
+        return np.triu_indices(n, 1)
+    a = np.minimum(u, v)
+    b = np.maximum(u, v)
+    keys = np.sort(a * n + b)  # 已有边的编号, 有序
+    degree = np.bincount(a, minlength=n) + np.bincount(b, minlength=n)
+    for _ in range(max_rounds):
+        deficit = np.maximum(delta - degree, 0)
+        if not deficit.any():
+            break
+        stubs = np.repeat(np.arange(n), deficit)
+        partners = rng.integers(n, size=len(stubs))
+        a = np.minimum(stubs, partners)
+        b = np.maximum(stubs, partners)
+        new_keys = sorted_unique((a * n + b)[a != b])  # 去掉自环与批内重边
+        position = np.minimum(np.searchsorted(keys, new_keys), max(len(keys) - 1, 0))
+        if len(keys):
+            new_keys = new_keys[keys[position] != new_keys]  # 去掉已有的边
+        degree += np.bincount(new_keys // n, minlength=n) + np.bincount(new_keys % n, minlength=n)
+        keys = np.sort(np.concatenate((keys, new_keys)))
+    if degree.min() >= delta:
+        return keys // n, keys % n
+    # 极稠密时随机抽样难以命中, 剩余部分逐点修复
+    graph = CSRGraph.from_edges(n, keys // n, keys % n).repair_min_degree(delta, rng)
+    src = np.repeat(np.arange(n), graph.degree)
+    upper = src < graph.indices
+    return src[upper], graph.indices[upper].astype(np.int64)
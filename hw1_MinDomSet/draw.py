@@ -7,27 +7,63 @@ import time
 import os
 import sys
 
+def plot_exact(x, exact_result, exact_optimal, exact_bound):
+    '''
+    画分支定界的结果: 已证明最优的点为实心, 超时未证明的点 (只是目前最优解) 为空心, 根节点下界为虚线
+    '''
+    proven = [(i, size) for i, size, optimal in zip(x, exact_result, exact_optimal) if optimal]
+    unproven = [(i, size) for i, size, optimal in zip(x, exact_result, exact_optimal) if not optimal]
+    if proven:
+        plt.plot(*zip(*proven), 'k.', label='Branch and Bound (optimal)')
+    if unproven:
+        plt.plot(*zip(*unproven), 'ko', mfc='none', markersize=3, label='Branch and Bound (best found, unproven)')
+    plt.plot(x, exact_bound, 'k--', label='Lower Bound')
+
 if __name__ == '__main__':
     os.chdir(sys.path[0])
 
     probability = 0.1  # 图中边连接概率
+    exact = False  # 是否用分支定界求精确解, 测量贪心的最优性差距
+    exact_time_limit = 10  # 单次精确求解的时间上限 (秒), 超时取目前最优解
+    # 注意: p=0.1 时分支定界约 80 个点以内才能在时限内证明最优, 下面 n=200 的扫描大多只能得到上下界
+    incremental = False  # 增量模式: 在上一个图上补边/加点得到嵌套图族, 并从上一个支配集热启动
 
     # 图像1
     n = 200  # 固定顶点数
     test_result = []
     test_result2 = []
+    exact_result = []
+    exact_optimal = []  # 是否已证明最优
+    exact_bound = []  # 根节点下界
     theory_result = []
+    dom_set, dom_set2 = None, None  # 热启动用的上一个支配集
+    if incremental:
+        MDS = MinDominatingSet(n, 1, probability)
     for delta in range(1, n):  # 改变最小度数
-        MDS = MinDominatingSet(n, delta, probability)
-        MDS.find_min_dom_set(0)
+        if incremental:
+            MDS.increase_min_degree(delta)
+        else:
+            MDS = MinDominatingSet(n, delta, probability)
+        MDS.find_min_dom_set(0, warm_start=dom_set)
         test_result.append(len(MDS.min_dom_set))
-        MDS.find_min_dom_set(1)
+        if incremental:
+            dom_set = MDS.min_dom_set
+        MDS.find_min_dom_set(1, warm_start=dom_set2)
         test_result2.append(len(MDS.min_dom_set))
+        if incremental:
+            dom_set2 = MDS.min_dom_set
+        if exact:
+            MDS.find_exact_min_dom_set(exact_time_limit)
+            exact_result.append(len(MDS.exact_dom_set))
+            exact_optimal.append(MDS.exact_optimal)
+            exact_bound.append(MDS.exact_lower_bound)
         theory_result.append(MDS.theoretical_min_dom_set_size)
     x = [i for i in range(1, n)]  # 横坐标
     l1 = plt.plot(x, test_result, 'r', label='Greedy Algorithm')
     l2 = plt.plot(x, test_result2, 'g', label='Better Greedy Algorithm')
     l3 = plt.plot(x, theory_result, 'b', label='Theoretical Size')
+    if exact:
+        plot_exact(x, exact_result, exact_optimal, exact_bound)
     plt.xlabel('Size of Delta')
     plt.ylabel('Size of The Dominating Set')
     plt.title(f'n = {n} probability = {probability}')
@@ -40,18 +76,39 @@ if __name__ == '__main__':
     delta = 2  # 固定最小度数
     test_result = []
     test_result2 = []
+    exact_result = []
+    exact_optimal = []  # 是否已证明最优
+    exact_bound = []  # 根节点下界
     theory_result = []
+    dom_set, dom_set2 = None, None  # 热启动用的上一个支配集
+    if incremental:
+        MDS = MinDominatingSet(delta + 1, delta, probability)
     for n in range(delta + 1, delta + 201):  # 改变顶点数
-        MDS = MinDominatingSet(n, delta, probability)
-        MDS.find_min_dom_set(0)
+        if incremental:
+            while MDS.n < n:
+                MDS.add_vertex()
+        else:
+            MDS = MinDominatingSet(n, delta, probability)
+        MDS.find_min_dom_set(0, warm_start=dom_set)
         test_result.append(len(MDS.min_dom_set))
-        MDS.find_min_dom_set(1)
+        if incremental:
+            dom_set = MDS.min_dom_set
+        MDS.find_min_dom_set(1, warm_start=dom_set2)
         test_result2.append(len(MDS.min_dom_set))
+        if incremental:
+            dom_set2 = MDS.min_dom_set
+        if exact:
+            MDS.find_exact_min_dom_set(exact_time_limit)
+            exact_result.append(len(MDS.exact_dom_set))
+            exact_optimal.append(MDS.exact_optimal)
+            exact_bound.append(MDS.exact_lower_bound)
         theory_result.append(MDS.theoretical_min_dom_set_size)
     x = [i for i in range(delta + 1, delta + 201)]  # 横坐标
     l1 = plt.plot(x, test_result, 'r', label='Greedy Algorithm')
     l2 = plt.plot(x, test_result2, 'g', label='Better Greedy Algorithm')
     l3 = plt.plot(x, theory_result, 'b', label='Theoretical Size')
+    if exact:
+        plot_exact(x, exact_result, exact_optimal, exact_bound)
     plt.xlabel('Size of Nodes')
     plt.ylabel('Size of The Dominating Set')
     plt.title(f'delta={delta} probability = {probability}')
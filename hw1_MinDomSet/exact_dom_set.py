@@ -0,0 +1,119 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Exact branch-and-bound solver for Min Dominating Set on small graphs
+
+import time
+
+class SearchTimeout(Exception):
+    pass
+
+def lower_bound(closed_nbhd, uncovered, allowed):
+    '''
+    剩余未支配点至少还需要的点数, 取两种下界的较大者
+    1. 收益从大到小累加, 达到未支配点数所需的最少点数
+    2. 支配者集合两两不相交的未支配点 (packing) 必须由不同的点支配
+    返回 None 表示无法支配
+    '''
+    gains = []
+    candidates = allowed
+    while candidates:
+        low = candidates & -candidates
+        gain = (closed_nbhd[low.bit_length() - 1] & uncovered).bit_count()
+        if gain:
+            gains.append(gain)
+        candidates ^= low
+    gains.sort(reverse=True)
+    remaining = uncovered.bit_count()
+    bound = 0
+    for gain in gains:
+        if remaining <= 0:
+            break
+        remaining -= gain
+        bound += 1
+    if remaining > 0:
+        return None
+
+    # 支配者少的点优先放入 packing
+    dominator_sets = []
+    rest = uncovered
+    while rest:
+        low = rest & -rest
+        dominators = closed_nbhd[low.bit_length() - 1] & allowed
+        dominator_sets.append((dominators.bit_count(), dominators))
+        rest ^= low
+    dominator_sets.sort()
+    packing = 0
+    blocked = 0  # 已放入 packing 的点的支配者
+    for _, dominators in dominator_sets:
+        if not dominators & blocked:
+            packing += 1
+            blocked |= dominators
+    return max(bound, packing)
+
+def exact_min_dom_set(closed_nbhd, incumbent, time_limit=None):
+    '''
+    位集分支定界求精确最小支配集
+    closed_nbhd: 每个点的闭邻域位集 (int)
+    incumbent: 初始可行解 (如贪心结果), 作为上界
+    time_limit: 秒, 超时返回目前最优解
+    返回 (最优支配集, 是否证明最优)
+    '''
+    n = len(closed_nbhd)
+    full = (1 << n) - 1
+    best = list(incumbent)
+    chosen = []
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    node_count = 0
+
+    def search(covered, excluded):
+        nonlocal best, node_count
+        node_count += 1
+        if deadline is not None and node_count % 256 == 0 and time.perf_counter() > deadline:
+            raise SearchTimeout()
+        uncovered = full & ~covered
+        if not uncovered:
+            best = chosen.copy()  # 能走到这里一定比当前最优解小
+            return
+        allowed = full & ~excluded
+        bound = lower_bound(closed_nbhd, uncovered, allowed)
+        if bound is None or len(chosen) + bound >= len(best):  # 剪枝
+            return
+
+        # 分支点: 可选支配者最少的未支配点
+        branch_dominators = None
+        rest = uncovered
+        while rest:
+            low = rest & -rest
+            dominators = closed_nbhd[low.bit_length() - 1] & allowed
+            if branch_dominators is None or dominators.bit_count() < branch_dominators.bit_count():
+                branch_dominators = dominators
+                if dominators.bit_count() <= 1:
+                    break
+            rest ^= low
+        if not branch_dominators:
+            return
+
+        # 按收益从大到小尝试每个支配者, 试过的点在后续分支中排除
+        order = []
+        while branch_dominators:
+            low = branch_dominators & -branch_dominators
+            u = low.bit_length() - 1
+            cover = closed_nbhd[u] & uncovered
+            order.append((-cover.bit_count(), u, cover))
+            branch_dominators ^= low
+        order.sort()
+        # 覆盖范围被另一个支配者包含的点无需分支 (可换成后者)
+        order = [(gain, u, cover) for k, (gain, u, cover) in enumerate(order)
+                 if not any(cover & ~other == 0 for _, _, other in order[:k])]
+        for _, u, _ in order:
+            chosen.append(u)
+            search(covered | closed_nbhd[u], excluded)
+            chosen.pop()
+            excluded |= 1 << u
+
+    try:
+        search(0, 0)
+        optimal = True
+    except SearchTimeout:
+        optimal = False
+    return sorted(best), optimal
@@ -0,0 +1,134 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Time-budgeted local search that shrinks a dominating set
+
+import random
+import time
+
+class DominatingSetState():
+    def __init__(self, adj, dominating_set):
+        '''
+        增量维护的支配集状态
+        adj: 邻接表; cov[v]: v 的闭邻域中支配集成员的个数
+        '''
+        self.adj = adj
+        self.n = len(adj)
+        self.cov = [0] * self.n
+        self.members = []  # 成员列表, 用于 O(1) 随机抽取
+        self.position = [-1] * self.n  # 成员在 members 中的位置, 不是成员时为 -1
+        for u in dominating_set:
+            if self.position[u] < 0:
+                self.add(u)
+
+    def add(self, x):
+        self.position[x] = len(self.members)
+        self.members.append(x)
+        self.cov[x] += 1
+        for w in self.adj[x]:
+            self.cov[w] += 1
+
+    def remove(self, u):
+        last = self.members.pop()  # 与末尾交换后删除
+        if last != u:
+            self.members[self.position[u]] = last
+            self.position[last] = self.position[u]
+        self.position[u] = -1
+        self.cov[u] -= 1
+        for w in self.adj[u]:
+            self.cov[w] -= 1
+
+    def is_redundant(self, u):
+        '''
+        删去 u 后仍是支配集, O(deg)
+        '''
+        cov = self.cov
+        return cov[u] >= 2 and all(cov[w] >= 2 for w in self.adj[u])
+
+    def prune(self, candidates):
+        '''
+        依次删去 candidates 中冗余的成员, 返回删去的个数
+        '''
+        removed = 0
+        for u in candidates:
+            if self.position[u] >= 0 and self.is_redundant(u):
+                self.remove(u)
+                removed += 1
+        return removed
+
+    def members_near(self, x):
+        '''
+        距 x 不超过 2 的成员, 加入 x 只可能使它们变得冗余
+        '''
+        near = set()
+        for y in [x, *self.adj[x]]:
+            if self.position[y] >= 0:
+                near.add(y)
+            for z in self.adj[y]:
+                if self.position[z] >= 0:
+                    near.add(z)
+        near.discard(x)
+        return near
+
+    def private_neighbors(self, u):
+        '''
+        只被 u 支配的点
+        '''
+        return [w for w in [u, *self.adj[u]] if self.cov[w] == 1]
+
+
+def refine_dom_set(adj, dominating_set, time_limit=1.0, max_iterations=None, patience=100):
+    '''
+    在时间预算内局部搜索缩小支配集, 返回过程中最小的支配集
+    1. 删去冗余成员 (每个 O(deg))
+    2. 2-for-1 交换: 加入一个非成员 x, 若 x 附近有两个成员因此变得冗余则删去, 支配集减小;
+       只删去一个时视为等大小的 1-for-1 交换同样接受, 用于在平台上移动
+    3. 连续 patience 次没有改进时做 1-for-2 扰动: 删去一个成员, 贪心补点 (通常为两个) 重新支配
+    '''
+    deadline = time.perf_counter() + time_limit
+    state = DominatingSetState(adj, dominating_set)
+    state.prune(sorted(state.members, key=lambda u: len(adj[u])))  # 优先删去度小的点
+    best = list(state.members)
+    iterations = 0
+    stall = 0
+    while state.members and time.perf_counter() < deadline:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        iterations += 1
+
+        if stall < patience:
+            # 2-for-1 / 1-for-1 交换
+            u = random.choice(state.members)
+            private = state.private_neighbors(u)
+            if not private:  # u 已冗余
+                state.remove(u)
+            else:
+                w = random.choice(private)
+                x = random.choice([w, *adj[w]])
+                if state.position[x] >= 0:
+                    stall += 1
+                    continue
+                state.add(x)
+                removed = state.prune(state.members_near(x))
+                if removed == 0:  # 没有成员变得冗余, 撤销
+                    state.remove(x)
+                    stall += 1
+                    continue
+                stall = 0 if removed >= 2 else stall + 1
+        else:
+            # 1-for-2 扰动
+            u = random.choice(state.members)
+            state.remove(u)
+            added = []
+            for w in [u, *adj[u]]:
+                if state.cov[w] == 0:  # 选能支配最多剩余点的点, 不选回 u
+                    candidates = [y for y in [w, *adj[w]] if y != u] or [u]
+                    x = max(candidates, key=lambda y: sum(state.cov[z] == 0 for z in [y, *adj[y]]))
+                    state.add(x)
+                    added.append(x)
+            for x in added:
+                state.prune(state.members_near(x))
+            stall = 0
+
+        if len(state.members) < len(best):
+            best = list(state.members)
+    return best
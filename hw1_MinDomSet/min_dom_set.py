@@ -4,111 +4,339 @@
 
 from matplotlib import colors
 from func_timer import timeit
+from csr_graph import CSRGraph, load_edge_list, random_csr_graph, fast_gnp_edges, repair_min_degree_edges
+from exact_dom_set import exact_min_dom_set, lower_bound
+from parallel_dom_set import parallel_greedy_dom_set
+from local_search import DominatingSetState, refine_dom_set
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import random
 import math
+import heapq
+
+def greedy_max_degree(degree, neighbors, initial=()):
+    '''
+    最大度贪心: 按度从大到小 (同度取编号小) 依次选入仍未被支配的点
+    degree: 度数组; neighbors(i): 返回 i 的邻居; initial: 热启动时已选入的点
+    '''
+    n = len(degree)
+    order = sorted(range(n), key=lambda i: -degree[i])  # 度数不变, 只需排序一次
+    dominated = [False] * n
+    dominating_set = list(initial)
+    for node in dominating_set:
+        dominated[node] = True
+        for j in neighbors(node):
+            dominated[j] = True
+    for node in order:
+        if not dominated[node]:
+            dominating_set.append(node)
+            dominated[node] = True
+            for j in neighbors(node):  # 删掉对应点的邻居
+                dominated[j] = True
+    return dominating_set
+
+def greedy_max_gain(degree, neighbors, initial=()):
+    '''
+    惰性最大堆实现的最大收益贪心
+    收益 = 未被支配的邻居数, 同收益时取编号最小的节点
+    选点后只更新新被支配节点的邻居, 总复杂度 O((n+m) log n)
+    degree: 度数组; neighbors(i): 返回 i 的邻居; initial: 热启动时已选入的点
+    '''
+    n = len(degree)
+    gain = list(degree)                             # 每个点的当前收益
+    dominated = [False] * n
+    selected = [False] * n
+    undominated_num = n
+    dominating_set = []
+
+    def select(node):
+        nonlocal undominated_num
+        # 更新 dominating_set
+        selected[node] = True
+        dominating_set.append(node)
+        # 新被支配的点使其所有邻居的收益减一
+        for j in [*neighbors(node), node]:
+            if not dominated[j]:
+                dominated[j] = True
+                undominated_num -= 1
+                for k in neighbors(j):
+                    gain[k] -= 1
+
+    for node in initial:
+        select(node)
+    heap = [(-gain[i], i) for i in range(n) if not selected[i]]  # (负收益, 编号), 堆中收益可能过期
+    heapq.heapify(heap)
+    first_undominated = 0  # 编号最小的未支配点 (单调后移)
+    while undominated_num:
+        neg_gain, node = heapq.heappop(heap)
+        if selected[node]:
+            continue
+        if -neg_gain != gain[node]:  # 收益过期, 放回堆中
+            heapq.heappush(heap, (-gain[node], node))
+            continue
+        if gain[node] == 0:  # 剩余未支配点没有未支配的邻居, 直接选入自身
+            heapq.heappush(heap, (0, node))
+            while dominated[first_undominated]:
+                first_undominated += 1
+            node = first_undominated
+        select(node)
+    return dominating_set
+
 
 class MinDominatingSet():
-    def __init__(self, n, delta, p=0.1):
+    def __init__(self, n, delta, p=0.1, backend="networkx", generator="sequential", seed=None):
+        '''
+        backend: "networkx" 使用 nx.Graph; "csr" 使用 NumPy CSR 数组, 画图时才转换为 networkx
+        generator: "sequential" 逐点对抽样; "skip" 几何跳跃采样 O(n+m) 并批量修复最小度
+        seed: 随机种子, 为 None 时由 random 模块派生 (随 random.seed 复现)
+        '''
         print("n:", n, "delta:", delta, "p:", p)
         self.n = n
         self.delta = delta
         self.p = p
+        if backend not in ("networkx", "csr"):
+            raise ValueError("Unknown backend! backend must be 'networkx' or 'csr'.")
+        if generator not in ("sequential", "skip"):
+            raise ValueError("Unknown generator! generator must be 'sequential' or 'skip'.")
+        self.backend = backend
+        self.generator = generator
+        self.seed = seed
+        self._rng = None
         self.graph = self.random_graph_with_min_degree(self.n, self.delta, self.p)
         self.theoretical_min_dom_set_bound()
     
+    @classmethod
+    def from_graph(cls, graph, backend="csr"):
+        '''
+        由已有的图 (CSRGraph 或 nx.Graph) 构造, delta 取图的最小度, p 取边密度
+        '''
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        if backend not in ("networkx", "csr"):
+            raise ValueError("Unknown backend! backend must be 'networkx' or 'csr'.")
+        self = cls.__new__(cls)
+        self.n = csr.n
+        self.delta = int(csr.degree.min()) if csr.n else 0
+        self.p = 2 * csr.number_of_edges() / (csr.n * (csr.n - 1)) if csr.n > 1 else 0
+        print("n:", self.n, "delta:", self.delta, "p:", self.p)
+        self.backend = backend
+        self.generator = None
+        self.seed = None
+        self._rng = None
+        self.graph = csr if backend == "csr" else csr.to_networkx()
+        self.theoretical_min_dom_set_bound()
+        return self
+
+    @property
+    def rng(self):
+        '''
+        NumPy 随机数生成器, 仅在 csr 后端或 skip 生成器首次用到时创建
+        networkx 后端的逐点对抽样不会因此多消耗 random 模块的状态
+        '''
+        if self._rng is None:
+            self._rng = np.random.default_rng(self.seed if self.seed is not None else random.getrandbits(64))
+        return self._rng
+
+    @classmethod
+    def from_file(cls, path, backend="csr", relabel=False):
+        '''
+        从文件读取图: .csr 为内存映射的二进制 CSR, 其余视为 (可 gzip 压缩的) 边列表
+        '''
+        if str(path).endswith(".csr"):
+            graph = CSRGraph.load(path)
+        else:
+            graph = load_edge_list(path, relabel=relabel)
+        return cls.from_graph(graph, backend)
+
     @timeit
     def random_graph_with_min_degree(self, n, delta, p, verification = False):
         """
         生成一个n节点图, 所有边连接概率为p, 同时保证节点最小度delta
         """
-        G = nx.Graph()
-        G.add_nodes_from(range(n))
-        if p >= 1 or delta>=n-1:
-            return nx.complete_graph(n, create_using=G)
-
-        for i in range(n):
-            node_nodes = range(i + 1, n)
-            random_edges = [j for j in node_nodes if random.random() < p]  # 按概率连接(所有边组合只会在此出现一次)
-            G.add_edges_from([(i, j) for j in random_edges])
-            
-            if G.degree(i) < delta:  # 最小度约束
-                remaining_nodes = [j for j in list(G.nodes) if j not in list(G.adj[i]) and i!=j]  # 在剩余所有可选点中选择
-                necessary_edges = random.sample(remaining_nodes, delta-G.degree(i))
-                G.add_edges_from([(i, j) for j in necessary_edges])
+        if self.generator == "skip":
+            u, v = fast_gnp_edges(n, p, self.rng)
+            u, v = repair_min_degree_edges(n, u, v, delta, self.rng)
+            if self.backend == "csr":
+                G = CSRGraph.from_edges(n, u, v)
+            else:
+                G = nx.Graph()
+                G.add_nodes_from(range(n))
+                G.add_edges_from(zip(u.tolist(), v.tolist()))
+        elif self.backend == "csr":
+            G = random_csr_graph(n, delta, p, self.rng)
+        else:
+            G = nx.Graph()
+            G.add_nodes_from(range(n))
+            if p >= 1 or delta>=n-1:
+                return nx.complete_graph(n, create_using=G)
+
+            for i in range(n):
+                node_nodes = range(i + 1, n)
+                random_edges = [j for j in node_nodes if random.random() < p]  # 按概率连接(所有边组合只会在此出现一次)
+                G.add_edges_from([(i, j) for j in random_edges])
+                
+                if G.degree(i) < delta:  # 最小度约束
+                    remaining_nodes = [j for j in list(G.nodes) if j not in list(G.adj[i]) and i!=j]  # 在剩余所有可选点中选择
+                    necessary_edges = random.sample(remaining_nodes, delta-G.degree(i))
+                    G.add_edges_from([(i, j) for j in necessary_edges])
         print("Random graph generated!")
 
         if verification:
             # min degree verification
-            min_degree = n
-            min_degree_node = None
-            for i in list(G.nodes):
-                if G.degree(i)<min_degree:
-                    min_degree = G.degree(i)
-                    min_degree_node = i
-            print("vertice", min_degree_node, "has min degree", min_degree, ".")
+            degree = G.degree if isinstance(G, CSRGraph) else np.array([G.degree(i) for i in range(n)])
+            min_degree_node = int(np.argmin(degree))
+            print("vertice", min_degree_node, "has min degree", degree[min_degree_node], ".")
         return G
 
     @timeit
-    def find_min_dom_set(self, method = 1, verification = False):
+    def increase_min_degree(self, delta):
+        '''
+        在当前图上为度数不足 delta 的点随机补边, 得到的图包含原图 (嵌套图族)
+        '''
+        if self.backend == "csr":
+            self.graph = self.graph.repair_min_degree(delta, self.rng)
+        else:
+            for i in range(self.n):
+                if self.graph.degree(i) < delta:
+                    self.graph.add_edges_from((i, j) for j in self.random_non_neighbors(i, delta - self.graph.degree(i)))
+        self.delta = delta
+        self.theoretical_min_dom_set_bound()
+
+    @timeit
+    def add_vertex(self):
+        '''
+        新增一个点, 以概率 p 连接已有点, 并保证其度不小于 delta (嵌套图族)
+        '''
+        new = self.n
+        if self.backend == "csr":
+            targets = np.flatnonzero(self.rng.random(new) < self.p)
+            src = np.repeat(np.arange(new), self.graph.degree)
+            graph = CSRGraph.from_edges(new + 1,
+                                        np.concatenate((src, np.full(len(targets), new))),
+                                        np.concatenate((self.graph.indices, targets)))
+            self.graph = graph.repair_min_degree(min(self.delta, new), self.rng)
+        else:
+            self.graph.add_node(new)
+            self.graph.add_edges_from((new, j) for j in range(new) if random.random() < self.p)
+            if self.graph.degree(new) < self.delta:  # 最小度约束
+                need = min(self.delta, new) - self.graph.degree(new)
+                self.graph.add_edges_from((new, j) for j in self.random_non_neighbors(new, need))
+        self.n += 1
+        self.theoretical_min_dom_set_bound()
+
+    def random_non_neighbors(self, i, k):
+        '''
+        随机选 k 个与 i 不相邻的点 (networkx 后端)
+        '''
+        adj = self.graph.adj[i]
+        if len(adj) + k > self.n // 2:  # 稠密时在剩余所有可选点中选择
+            return random.sample([j for j in range(self.n) if j not in adj and j != i], k)
+        targets = set()
+        while len(targets) < k:  # 稀疏时拒绝采样
+            j = random.randrange(self.n)
+            if j not in adj and j != i:
+                targets.add(j)
+        return sorted(targets)
+
+    def degree_and_neighbors(self):
+        '''
+        与后端无关的度数组与邻居访问函数, 供贪心引擎使用
+        '''
+        if self.backend == "csr":
+            return self.graph.degree.tolist(), self.graph.neighbors
+        return [self.graph.degree(i) for i in range(self.n)], lambda i: self.graph.adj[i]
+
+    def is_dominating_set(self, nodes):
+        '''
+        验证是否支配
+        '''
+        if self.backend == "csr":
+            return self.graph.is_dominating_set(nodes)
+        return nx.algorithms.is_dominating_set(self.graph, nodes)  # networkx函数验证
+
+    def to_networkx(self):
+        '''
+        networkx 形式的图, 用于画图
+        '''
+        if self.backend == "csr":
+            return self.graph.to_networkx()
+        return self.graph
+
+    @timeit
+    def find_min_dom_set(self, method = 1, verification = False, workers = None, epsilon = 0.1, warm_start = None):
         '''
         贪心算法寻找最小支配集
-        method: 0 每次找剩余最大度节点; 1 每次找最大收益节点
-        '''
-        if method == 0:
-            remaining_set = list(self.graph.nodes)
-            dominating_set = []
-            while len(remaining_set):
-                max_degree = 0
-                max_degree_node = None
-                for i in remaining_set:
-                    if self.graph.degree(i) > max_degree:  # 找最大度
-                        max_degree = self.graph.degree(i)
-                        max_degree_node = i
-                # 更新剩余集合
-                dominating_set.append(max_degree_node)
-                remaining_set.remove(max_degree_node)
-                remaining_set =[node for node in remaining_set if node not in list(self.graph.adj[max_degree_node])]  # 删掉对应点的邻居
+        method: 0 每次找剩余最大度节点; 1 每次找最大收益节点;
+                2 多进程分轮近似贪心, 每轮选入收益不低于最大收益 1/(1+epsilon) 的点
+        workers: method 2 的进程数, 默认为 CPU 核数
+        warm_start: 上一个 (子) 图的支配集, 贪心从它出发补全, 再删去冗余点 (method 0, 1)
+        '''
+        degree, neighbors = self.degree_and_neighbors()
+        if warm_start is not None and method in (0, 1):
+            engine = greedy_max_degree if method == 0 else greedy_max_gain
+            dominating_set = engine(degree, neighbors, initial=warm_start)
+            state = DominatingSetState([list(neighbors(i)) for i in range(self.n)], dominating_set)
+            state.prune(sorted(dominating_set, key=lambda u: degree[u]))  # 优先删去度小的点
+            dominating_set = state.members
+        elif method == 0:
+            dominating_set = greedy_max_degree(degree, neighbors)
         elif method == 1:
-            dominating_set = []                         # 支配集
-            undominated_set = list(self.graph.nodes)    # 未被支配的点
-            undominated_neighbors = {}                  # 为每个可选点维护未被支配的邻居dict，换句话说，选择某个点能带来的收益
-            for i in range(self.n):
-                undominated_neighbors[i] = list(self.graph.adj[i].keys())
-            
-            # 找到最大收益点
-            while len(undominated_set):
-                max_gain = 0
-                max_gain_node = None
-                for i in undominated_neighbors:
-                    if len(undominated_neighbors[i]) > max_gain:  # 找最大收益
-                        max_gain = len(undominated_neighbors[i])
-                        max_gain_node = i
-
-                # 更新 dominating_set
-                dominating_set.append(max_gain_node)
-                # 更新 undominated_neighbors
-                undominated_neighbors.pop(max_gain_node)
-                for j in [*list(self.graph.adj[max_gain_node]),max_gain_node]:
-                    for i in undominated_neighbors:
-                        if j in undominated_neighbors[i]:
-                            undominated_neighbors[i].remove(j)
-                # 更新 undominated_set
-                if max_gain_node in undominated_set:
-                    undominated_set.remove(max_gain_node)
-                undominated_set =[node for node in undominated_set if node not in list(self.graph.adj[max_gain_node])]
+            dominating_set = greedy_max_gain(degree, neighbors)
+        elif method == 2:
+            graph = self.graph if self.backend == "csr" else CSRGraph.from_networkx(self.graph)
+            dominating_set = parallel_greedy_dom_set(graph, workers, epsilon)
 
         print("Dominating set found!")
         self.min_dom_set = dominating_set
 
         if verification:
-            # networkx函数验证是否支配
-            print("Dominating verification:", nx.algorithms.is_dominating_set(self.graph, self.min_dom_set))
+            print("Dominating verification:", self.is_dominating_set(self.min_dom_set))
     
         return self.min_dom_set
 
+    @timeit
+    def refine_min_dom_set(self, time_limit=1.0, max_iterations=None, verification = False):
+        '''
+        在时间预算内对 self.min_dom_set 做局部搜索 (删冗余点、交换), 保留过程中最小的支配集
+        '''
+        degree, neighbors = self.degree_and_neighbors()
+        adj = [list(neighbors(i)) for i in range(self.n)]
+        size = len(self.min_dom_set)
+        self.min_dom_set = refine_dom_set(adj, self.min_dom_set, time_limit, max_iterations)
+        print("Dominating set refined:", size, "->", len(self.min_dom_set))
+
+        if verification:
+            print("Dominating verification:", self.is_dominating_set(self.min_dom_set))
+
+        return self.min_dom_set
+
+    @timeit
+    def find_exact_min_dom_set(self, time_limit=60, verification = False):
+        '''
+        位集分支定界寻找精确最小支配集, 以最大收益贪心的结果作为初始上界, 超时返回目前最优解
+        p=0.1 时约 80 个点以内可在 10 秒内证明最优; n≈200, p=0.1 已超出可证明的范围, 通常只能返回贪心解
+        结果存入 self.exact_dom_set, self.exact_optimal 表示是否已证明最优,
+        self.exact_lower_bound 为根节点下界 (已证明最优时即最优值), 与 exact_dom_set 一起从两侧界定最优值
+        '''
+        degree, neighbors = self.degree_and_neighbors()
+        closed_nbhd = []  # 闭邻域位集
+        for i in range(self.n):
+            bits = 1 << i
+            for j in neighbors(i):
+                bits |= 1 << j
+            closed_nbhd.append(bits)
+        incumbent = greedy_max_gain(degree, neighbors)
+        self.exact_dom_set, self.exact_optimal = exact_min_dom_set(closed_nbhd, incumbent, time_limit)
+        full = (1 << self.n) - 1
+        self.exact_lower_bound = len(self.exact_dom_set) if self.exact_optimal else lower_bound(closed_nbhd, full, full)
+        print("Exact dominating set found!" if self.exact_optimal else "Time limit reached, best dominating set returned!")
+
+        if verification:
+            print("Dominating verification:", self.is_dominating_set(self.exact_dom_set))
+
+        return self.exact_dom_set
+
     def theoretical_min_dom_set_bound(self):
         '''
         计算理论上的最小支配集上界
@@ -122,8 +350,10 @@ class MinDominatingSet():
         '''
         fig, ax = plt.subplots()
 
-        colors = ["gold" if node in self.min_dom_set else "lightblue" for node in list(self.graph.nodes)]
-        nx.draw(self.graph,
+        graph = self.to_networkx()
+        dom_set = set(self.min_dom_set)
+        colors = ["gold" if node in dom_set else "lightblue" for node in list(graph.nodes)]
+        nx.draw(graph,
                 node_color=colors,
                 node_size=1000,
                 with_labels=True,
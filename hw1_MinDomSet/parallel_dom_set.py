@@ -0,0 +1,99 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Parallel-rounds approximate greedy for Min Dominating Set over shared-memory CSR arrays
+
+from multiprocessing import Pool, shared_memory
+import numpy as np
+import math
+import os
+
+_shared = {}  # 当前进程可见的共享数组 {名称: ndarray}
+_handles = []  # 工作进程中挂载的共享内存, 防止被回收
+
+def _attach(specs):
+    '''
+    工作进程初始化: 按名称挂载共享内存数组
+    '''
+    for key, (name, dtype, shape) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _handles.append(shm)
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _compute_gains(bounds):
+    '''
+    计算 [lo, hi) 内每个点的收益 = 闭邻域中未被支配的点数
+    '''
+    lo, hi = bounds
+    indptr, indices = _shared["indptr"], _shared["indices"]
+    undominated, gains = _shared["undominated"], _shared["gains"]
+    start, end = indptr[lo], indptr[hi]
+    prefix = np.zeros(end - start + 1, dtype=np.int64)
+    np.cumsum(undominated[indices[start:end]], out=prefix[1:])
+    gains[lo:hi] = (prefix[indptr[lo + 1:hi + 1] - start] - prefix[indptr[lo:hi] - start]
+                    + undominated[lo:hi])
+
+def _greedy_rounds(pool, shards, epsilon):
+    '''
+    分轮选点, 直到所有点被支配
+    '''
+    indptr, indices = _shared["indptr"], _shared["indices"]
+    undominated, gains = _shared["undominated"], _shared["gains"]
+    dominating_set = []
+    while undominated.any():
+        if pool:
+            pool.map(_compute_gains, shards)
+        else:
+            for shard in shards:
+                _compute_gains(shard)
+        threshold = max(1, math.ceil(gains.max() / (1 + epsilon)))
+        candidates = np.flatnonzero(gains >= threshold)
+        candidates = candidates[np.argsort(-gains[candidates], kind="stable")]
+        for v in candidates.tolist():  # 收益仍达到阈值的候选点选入
+            closed = np.append(indices[indptr[v]:indptr[v + 1]], v)
+            if int(undominated[closed].sum()) >= threshold:
+                dominating_set.append(v)
+                undominated[closed] = 0
+    return dominating_set
+
+def parallel_greedy_dom_set(graph, workers=None, epsilon=0.1, shards_per_worker=4):
+    '''
+    分轮近似贪心 (Jia-Rajaraman-Suel 风格)
+    每轮由进程池分片并行重算所有点的收益, 阈值取当前最大收益的 1/(1+epsilon),
+    收益仍不低于阈值的点在本轮选入; 每轮过后最大收益必然降到阈值以下
+    graph: CSRGraph; workers: 进程数, 为 1 时在当前进程计算
+    '''
+    workers = workers or os.cpu_count()
+    n = graph.n
+    arrays = {
+        "indptr": np.asarray(graph.indptr, dtype=np.int64),
+        "indices": np.asarray(graph.indices),
+        "undominated": np.ones(n, dtype=np.uint8),
+        "gains": np.zeros(n, dtype=np.int64),
+    }
+    handles = []
+    specs = {}
+    for key, array in arrays.items():  # 邻接数组与状态放入共享内存
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        handles.append(shm)
+        _shared[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        _shared[key][:] = array
+        specs[key] = (shm.name, array.dtype, array.shape)
+    del arrays
+
+    # 按边数均分成若干片
+    cuts = np.searchsorted(_shared["indptr"], np.linspace(0, graph.indptr[-1], workers * shards_per_worker + 1))
+    cuts[0], cuts[-1] = 0, n
+    cuts = sorted(set(cuts.tolist()))
+    shards = list(zip(cuts[:-1], cuts[1:]))
+
+    pool = Pool(workers, initializer=_attach, initargs=(specs,)) if workers > 1 else None
+    try:
+        return _greedy_rounds(pool, shards, epsilon)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        _shared.clear()
+        for shm in handles:
+            shm.close()
+            shm.unlink()
@@ -13,6 +13,7 @@ import matplotlib.pyplot as plt
 if __name__ == '__main__':
     os.chdir(sys.path[0])
     n = 50  # 固定顶点数
+    incremental = True  # 同时测试逐点增长: 一次构建, 每次只加一个点并为新边染色, 记录累计用时
     test_result = []
     test2_result = []
     for i in range(4, n):  # 测试旧方法所需时间
@@ -27,9 +28,20 @@ if __name__ == '__main__':
         MK4.coloring()
         t2 = time.time()
         test2_result.append(t2 - t1)
+    if incremental:
+        test3_result = []
+        t1 = time.time()
+        MK4 = monochromatic_k4.MonochromaticK4(4)
+        MK4.coloring()
+        test3_result.append(time.time() - t1)
+        for i in range(5, n):
+            MK4.add_vertex()
+            test3_result.append(time.time() - t1)
     x = [i for i in range(4, n)]  # 横坐标
     l1 = plt.plot(x, test_result, 'r', label='Before Refinement')
     l2 = plt.plot(x, test2_result, 'b', label='After Refinement')
+    if incremental:
+        l3 = plt.plot(x, test3_result, 'g', label='Incremental Growth (cumulative)')
     plt.xlabel('Size of Nodes')
     plt.ylabel('Seconds')
     plt.title(f'n = {n}')
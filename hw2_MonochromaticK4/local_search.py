@@ -0,0 +1,113 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Incremental flip-based local search that reduces the monochromatic K4 count
+
+import time
+import numpy as np
+
+class FlipState():
+    def __init__(self, color_matrix):
+        '''
+        增量维护的染色状态 (完全图, 所有边已染色)
+        mono[u, v]: 包含边 uv 的同色 K4 个数
+        near[u, v]: 包含边 uv 且其余 5 条边都是另一种颜色的 K4 个数, 翻转 uv 后即成为同色 K4
+        翻转 uv 使同色 K4 总数变化 near - mono
+        '''
+        self.n = len(color_matrix)
+        self.color = np.array(color_matrix, dtype=np.int8)
+        self.upper = np.triu(np.ones((self.n, self.n), dtype=bool), 1)
+        # Q[c][u, v]: c 色下 N(u)∩N(v) 中的 c 色边数
+        Q = np.zeros((2, self.n, self.n), dtype=np.int64)
+        for c in range(2):
+            A = (self.color == c).astype(np.float32)
+            for u in range(self.n):
+                neighbors = np.flatnonzero(A[u])
+                S = A[:, neighbors]
+                B = S[neighbors]
+                Q[c][u] = ((S @ B) * S).astype(np.int64).sum(axis=1) // 2  # 先转 int64 再求和, 避免 float32 精度损失
+        self.mono = np.where(self.color == 0, Q[0], Q[1])
+        self.near = np.where(self.color == 0, Q[1], Q[0])
+        np.fill_diagonal(self.mono, 0)
+        np.fill_diagonal(self.near, 0)
+        self.count = int(self.mono[self.upper].sum()) // 6
+        self.pair_w, self.pair_x = np.triu_indices(max(self.n - 2, 0), 1)
+
+    def delta(self):
+        '''
+        每条边翻转后同色 K4 数的变化
+        '''
+        return self.near - self.mono
+
+    def flip(self, u, v):
+        '''
+        翻转边 uv 的颜色, 只更新包含 uv 的 C(n-2, 2) 个 K4, O(n^2)
+        '''
+        n = self.n
+        color = self.color
+        old = color[u, v]
+        new = 1 - old
+        others = np.delete(np.arange(n), [u, v])
+        w, x = others[self.pair_w], others[self.pair_x]
+        ends = [(u, w), (u, x), (v, w), (v, x), (w, x)]  # 其余 5 条边
+        is_new = [color[a, b] == new for a, b in ends]
+        k = np.sum(is_new, axis=0)  # 其余边中新颜色的条数
+
+        mono_keys, mono_values, near_keys, near_values = [], [], [], []
+        for (a, b), edge_new in zip(ends, is_new):
+            key = a * n + b
+            # 其余边全是旧颜色: 原为同色 K4, 翻转后不再是; 全是新颜色: 翻转后成为同色 K4
+            changed = (k == 0) | (k == 5)
+            mono_keys.append(key[changed])
+            mono_values.append(np.where(k[changed] == 0, -1, 1))
+            # 唯一的新颜色边: 翻转前 uv 与另 4 条都是旧颜色, 此后不再 near
+            # 唯一的旧颜色边: 翻转后其余 5 条都是新颜色, 成为 near
+            lone = ((k == 1) & edge_new) | ((k == 4) & ~edge_new)
+            near_keys.append(key[lone])
+            near_values.append(np.where(k[lone] == 1, -1, 1))
+        mono_change = np.bincount(np.concatenate(mono_keys), np.concatenate(mono_values),
+                                  minlength=n * n).astype(np.int64).reshape(n, n)
+        near_change = np.bincount(np.concatenate(near_keys), np.concatenate(near_values),
+                                  minlength=n * n).astype(np.int64).reshape(n, n)
+        mono_change += mono_change.T
+        near_change += near_change.T
+        self.mono += mono_change
+        self.near += near_change
+
+        self.count += int(self.near[u, v] - self.mono[u, v])
+        self.mono[u, v], self.near[u, v] = self.near[u, v], self.mono[u, v]
+        self.mono[v, u], self.near[v, u] = self.mono[u, v], self.near[u, v]
+        color[u, v] = color[v, u] = new
+
+
+def refine_coloring(color_matrix, time_limit=1.0, max_iterations=None, tabu=None):
+    '''
+    在时间预算内做翻转局部搜索 (禁忌搜索), 返回 (过程中最好的染色, 其同色 K4 数)
+    每步翻转 delta 最小的非禁忌边, delta >= 0 时同样接受, 以跳出局部最优;
+    刚翻转过的边在 tabu 步内不能翻回, 除非能得到新的最好解
+    '''
+    deadline = time.perf_counter() + time_limit
+    state = FlipState(color_matrix)
+    n = state.n
+    tabu = max(n // 4, 1) if tabu is None else tabu
+    tabu_until = np.zeros((n, n), dtype=np.int64)
+    best = state.color.copy()
+    best_count = state.count
+    iterations = 0
+    while best_count > 0 and time.perf_counter() < deadline:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        iterations += 1
+
+        delta = state.delta()
+        allowed = state.upper & ((tabu_until < iterations) | (state.count + delta < best_count))
+        if not allowed.any():
+            break
+        delta = np.where(allowed, delta, np.iinfo(np.int64).max)
+        u, v = divmod(int(np.argmin(delta)), n)
+        state.flip(u, v)
+        tabu_until[u, v] = iterations + tabu
+
+        if state.count < best_count:
+            best = state.color.copy()
+            best_count = state.count
+    return best, best_count
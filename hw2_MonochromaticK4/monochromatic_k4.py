@@ -2,98 +2,337 @@
 # Date: April 8th, 2022
 # Description: Greedy Algorithm for Monochromatic K4
 
+import os
 import math
 import random
 import itertools
+import numpy as np
+from local_search import refine_coloring
+from sparse_k4 import list_K4
 import networkx as nx
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+
+COLORS = ("white", "black")  # 颜色编号
+
+# --- K4 状态编码 (int8) ---
+# 0: 未染色; +k: 首色为 white 且已染 k 条同色边; -k: 首色为 black; MIXED: 出现异色边
+# 以 2^-5 为单位, 同色 k 条边的 I_k 为整数 2^(k-1), 收益与状态转移都查表完成
+MIXED = -128
+WEIGHT = np.zeros((2, 256), dtype=np.int64)  # WEIGHT[color][state 的 uint8 视图]: 该色收益
+NEXT_STATE = np.zeros((2, 256), dtype=np.int8)  # NEXT_STATE[color][state]: 染色后的状态
+for state in [*range(-6, 7), MIXED]:
+    for color, sign in ((0, 1), (1, -1)):  # white 为正, black 为负
+        if state != MIXED and state * sign > 0:  # 同色
+            WEIGHT[color][state & 0xff] = 1 << (abs(state) - 1)
+            NEXT_STATE[color][state & 0xff] = state + sign
+        elif state == 0:  # 未染色
+            NEXT_STATE[color][state & 0xff] = sign
+        else:  # 异色
+            NEXT_STATE[color][state & 0xff] = MIXED
+
+def binomial_table(n):
+    '''
+    binom[k][i] = C(i, k), k <= 4, i < n
+    '''
+    return np.array([[math.comb(i, k) for i in range(n)] for k in range(5)], dtype=np.int64)
+
+def related_ranks(binom, u, v, w, x):
+    '''
+    K4 {u, v, w[i], x[i]} 的编号, u < v, w < x 且 w, x 不含 u, v
+    '''
+    # 每个顶点在升序 K4 中的位置 = 比它小的顶点个数
+    pos_u = (w < u).astype(np.int64) + (x < u)
+    pos_v = 1 + (w < v).astype(np.int64) + (x < v)
+    pos_w = (u < w).astype(np.int64) + (v < w)
+    pos_x = 1 + (u < x).astype(np.int64) + (v < x)
+    return binom[pos_u + 1, u] + binom[pos_v + 1, v] + binom[pos_w + 1, w] + binom[pos_x + 1, x]
+
+def state_from_colors(colors):
+    '''
+    由 K4 各边颜色 (每列一个 K4, -1 未染色) 计算状态: 已染边同色时为 ±已染边数, 否则 MIXED
+    '''
+    white = (colors == 0).sum(axis=0)
+    black = (colors == 1).sum(axis=0)
+    state = np.where(white > 0, white, -black).astype(np.int8)
+    return np.where((white > 0) & (black > 0), np.int8(MIXED), state)
+
+def count_k4(color_matrix, per_edge=False):
+    '''
+    完全图染色 color_matrix (n×n, -1 未染色) 中同色K4的数量
+    对每条同色边 (u, v), 取该颜色下的公共邻居 N(u)∩N(v), 其中的同色边数即包含 (u, v) 的同色 K4 数
+    计数时只取比 v 大的公共邻居, 每个 K4 只在其最小的两个顶点处计一次;
+    以 u 的邻居导出子图为单位批量求交, 交集内的边数用矩阵乘法统计
+    每种颜色、每个顶点一个邻接位集 (packbits 压缩); float32 乘积的每个元素不超过 n, 是精确整数,
+    但总和可达 n^3 (超过 2^24), 因此先转为 int64 再求和
+    per_edge: 同时返回每条边参与的同色K4数 (n×n 矩阵)
+    '''
+    n = len(color_matrix)
+    sum = 0
+    participation = np.zeros((n, n), dtype=np.int64) if per_edge else None
+    for color in range(len(COLORS)):
+        bitsets = np.packbits(color_matrix == color, axis=1)
+        for u in range(n):
+            neighbors = np.flatnonzero(np.unpackbits(bitsets[u], count=n))
+            higher = neighbors[neighbors > u]
+            if len(higher) >= 3:
+                sub = np.unpackbits(bitsets[higher], axis=1, count=n)[:, higher].astype(np.float32)
+                upper = np.triu(sub, 1)  # 第 i 行: N(u)∩N(v_i) 中比 v_i 大的点
+                sum += int(((upper @ sub) * upper).astype(np.int64).sum()) // 2
+            if per_edge and len(neighbors) >= 2:
+                sub = np.unpackbits(bitsets[neighbors], axis=1, count=n)[:, neighbors].astype(np.float32)
+                participation[u, neighbors] = ((sub @ sub) * sub).astype(np.int64).sum(axis=1) // 2
+    if per_edge:
+        return sum, participation
+    return sum
+
 class MonochromaticK4():
-    def __init__(self, nodes):
+    def __init__(self, nodes=None, graph=None):
         '''
         定义完全图, 初始化数据结构
+        graph: 给定任意 (稀疏) 图时只对图中实际存在的 K4 计算, 此时 nodes 可省略
         '''
+        if graph is not None:
+            self.init_sparse(graph)
+            return
+        self.sparse = False
+        self.n = nodes
         self.graph = nx.complete_graph(nodes)
 
-        # --- K4 字典 ---
-        # {K4id: [[K4顶点], I_k, 已选颜色]}
-        # 异色状态: 0: 未支配, 1: 支配
+        # --- K4 状态 ---
+        # K4 不再显式存储, 按组合数系统 (colex 序) 编号:
+        # {a<b<c<d} -> C(a,1) + C(b,2) + C(c,3) + C(d,4)
+        # K4_state[编号]: 首色与同色边数 (编码见 MIXED)
         # |已染|  0 |  1 |  2 |  3 |  4 |  5 |  6 |异色边|
         # |I_k|2^-5|2^-5|2^-4|2^-3|2^-2|2^-1|2^-0|  0  |
-        self.K4_dict = self.find_K4()
+        self.binom = binomial_table(nodes)
+        self.K4_num = math.comb(nodes, 4)
+        self.K4_state = np.zeros(self.K4_num, dtype=np.int8)  # 初始染色0条, 未定颜色
+        self.pair_w, self.pair_x = np.triu_indices(max(nodes - 2, 0), 1)  # 其余 n-2 个点中的点对 {w, x}
 
         # --- 边 属性 ---
-        # 边: {related_K4: [相关K4id], color: [颜色]}
-        nx.set_edge_attributes(self.graph, None, "related_K4")  # 为边添加“相关的K4”属性
+        # 边: {color: [颜色]}, 相关 K4 由 related_K4 即时生成
         nx.set_edge_attributes(self.graph, "None", "color")  # 为边添加“颜色”属性
-        for e1, e2 in self.graph.edges:
-            self.graph[e1][e2]['related_K4'] = []  # 赋初始空列表
-        self.find_related_K4()
+        self.color_matrix = np.full((nodes, nodes), -1, dtype=np.int8)  # 边颜色编号矩阵, -1 未染色
+        self.cursor = 0  # 已染色的边数 (color_sequence 中的位置)
+        self.checkpoint_dir = None
 
-    def find_K4(self):
+    def init_sparse(self, graph):
         '''
-        寻找完全图的4顶点完全子图
+        稀疏图模式: 按退化序列出所有 K4, 用紧凑数组按边索引
+        K4_edges[k]: 第 k 个 K4 的 6 条边; 边 e 所在的 K4 为 edge_K4[K4_indptr[e]:K4_indptr[e+1]]
         '''
-        K4 = [c for c in itertools.combinations(list(self.graph.nodes), 4)]
-        K4_dict = {}
-        for i in range(len(K4)):
-            K4_dict[i] = [K4[i], 2 ** -5, None]  # 初始染色0条 未定颜色
-        return K4_dict
+        if set(graph.nodes) != set(range(graph.number_of_nodes())):
+            graph = nx.convert_node_labels_to_integers(graph, ordering="sorted")
+        self.sparse = True
+        self.n = graph.number_of_nodes()
+        self.graph = nx.Graph(graph)
+        edges = list(self.graph.edges)
+        self.edge_id = {}
+        for e, (u, v) in enumerate(edges):
+            self.edge_id[(u, v)] = self.edge_id[(v, u)] = e
+        self.K4_edges, self.K4_indptr, self.edge_K4 = list_K4(self.n, edges)
+        self.K4_num = len(self.K4_edges)
+        self.K4_state = np.zeros(self.K4_num, dtype=np.int8)
+        nx.set_edge_attributes(self.graph, "None", "color")
+        self.edge_color = np.full(len(edges), -1, dtype=np.int8)  # 按边编号的颜色, -1 未染色
+        self.cursor = 0
+        self.checkpoint_dir = None
 
-    def find_related_K4(self):
+    def rank_K4(self, nodes):
         '''
-        寻找每条边相关的K4
+        K4 顶点 -> 编号
         '''
-        for i in range(len(self.K4_dict)):
-            nodes = self.K4_dict[i][0]
-            for e1, e2 in itertools.combinations(nodes, 2):
-                target = self.graph[e1][e2]['related_K4']
-                target.append(i)
+        return sum(math.comb(node, k + 1) for k, node in enumerate(sorted(nodes)))
 
-    def coloring(self):
+    def unrank_K4(self, rank):
+        '''
+        编号 -> K4 顶点 (升序)
+        '''
+        nodes = []
+        for k in range(4, 0, -1):  # 从最大的顶点开始贪心确定
+            node = k - 1
+            while math.comb(node + 1, k) <= rank:
+                node += 1
+            nodes.append(node)
+            rank -= math.comb(node, k)
+        return tuple(reversed(nodes))
+
+    def related_K4(self, e1, e2):
+        '''
+        边 (e1, e2) 相关的 C(n-2, 2) 个 K4 的编号, 由其余点对 {w, x} 即时生成
+        稀疏图模式下直接查边 -> K4 索引
+        '''
+        if self.sparse:
+            e = self.edge_id[(e1, e2)]
+            return self.edge_K4[self.K4_indptr[e]:self.K4_indptr[e + 1]]
+        u, v = min(e1, e2), max(e1, e2)
+        others = np.delete(np.arange(self.n), [u, v])
+        return related_ranks(self.binom, u, v, others[self.pair_w], others[self.pair_x])
+
+    def coloring(self, workers=1, checkpoint=None, checkpoint_every=10000):
         '''
         一种染色算法
+        workers: 大于 1 时按其余点对分片, 由多个进程并行计算收益, 结果与单进程相同
+        checkpoint: 检查点目录, 每染 checkpoint_every 条边保存一次, 可由 resume 从中断处继续
+        从 self.cursor 处继续染色 (新建时为 0)
+        '''
+        if not self.cursor:
+            self.color_sequence = list(self.graph.edges)  # (伪随机的)染色顺序
+        pending = self.color_sequence[self.cursor:]
+
+        if workers > 1:
+            if self.sparse or checkpoint is not None or self.checkpoint_dir is not None:
+                raise ValueError("Sharded coloring is only available on complete graphs without checkpoints")
+            from parallel_coloring import ShardedRewards  # 延迟导入, 避免循环引用
+            with ShardedRewards(self, workers) as sharded:
+                for e1, e2 in tqdm(pending):
+                    reward_w, reward_b = sharded.rewards(e1, e2)
+                    color = 0 if reward_w < reward_b else 1
+                    self.set_color(e1, e2, color)
+                    sharded.commit(color)
+                    self.cursor += 1
+            return
+
+        if checkpoint is not None and checkpoint != self.checkpoint_dir:
+            self.enable_checkpoint(checkpoint)
+        for e1, e2 in tqdm(pending, initial=self.cursor, total=len(self.color_sequence)):  # 比较黑白收益 执行染色
+            related = self.related_K4(e1, e2)
+            state = self.K4_state[related].view(np.uint8)
+            # 染色 (e1, e2) 为 color 的收益: 同色 K4 的 I_k 之和, 未染色与异色的 K4 收益为 0
+            reward_w = WEIGHT[0][state].sum()
+            reward_b = WEIGHT[1][state].sum()
+            color = 0 if reward_w < reward_b else 1
+            # 染色, 同时更新相关K4的染色状态
+            self.set_color(e1, e2, color)
+            if self.checkpoint_dir is not None:
+                self.sequence_colors[self.cursor] = color  # 先记录颜色, 中断时据此修复状态
+            self.K4_state[related] = NEXT_STATE[color][state]
+            self.cursor += 1
+            if self.checkpoint_dir is not None and self.cursor % checkpoint_every == 0:
+                self.save_checkpoint()
+        if self.checkpoint_dir is not None:
+            self.save_checkpoint()
+
+    def enable_checkpoint(self, path):
+        '''
+        在目录 path 下建立检查点, 此后 K4_state 直接存放在内存映射文件中:
+        state.npy: K4 状态; colors.npy: 按染色顺序的边颜色 (-1 未染色); cursor.npy: [n, 已染边数]
+        写入只落在页缓存, 保存检查点时才 flush
+        '''
+        if self.sparse:
+            raise ValueError("Checkpoints are only available on complete graphs")
+        os.makedirs(path, exist_ok=True)
+        if not self.cursor:
+            self.color_sequence = list(self.graph.edges)
+        state = np.lib.format.open_memmap(os.path.join(path, "state.npy"), mode="w+",
+                                          dtype=np.int8, shape=self.K4_state.shape)
+        state[:] = self.K4_state
+        self.K4_state = state
+        self.sequence_colors = np.lib.format.open_memmap(os.path.join(path, "colors.npy"), mode="w+",
+                                                         dtype=np.int8, shape=(len(self.color_sequence),))
+        self.sequence_colors[:] = [self.color_matrix[e1, e2] for e1, e2 in self.color_sequence]
+        self.checkpoint_dir = path
+        self.save_checkpoint()
+
+    def save_checkpoint(self):
+        '''
+        flush 内存映射文件, 再原子地写入游标
         '''
-        def update_W(self, e1, e2, color):
-            '''
-            计算染色 (e1, e2) 为 color 在全局的收益
-            '''
-            reward = 0
-            for k in self.graph[e1][e2]['related_K4']:
-                # 计算染色 (e1, e2) 为 color 在 k 中的收益
-                if self.K4_dict[k][2] == None:  # 未染色
-                    reward += 0
-                else:
-                    if color == self.K4_dict[k][2]:  # 同色
-                        reward += self.K4_dict[k][1]
-                    else:  # 异色
-                        reward += 0
-            return reward
-
-        def color_edge(e1, e2, color):
-            '''
-            染色 (e1, e2) 为 color, 同时更新相关K4的染色状态
-            '''
-            self.graph[e1][e2]['color'] = color
-            for k in self.graph[e1][e2]['related_K4']:
-                if self.K4_dict[k][2] == None:  # 未染色
-                    self.K4_dict[k][2] = color
-                else:
-                    if color == self.K4_dict[k][2]:  # 同色
-                        self.K4_dict[k][1] *= 2
-                    else:  # 异色
-                        self.K4_dict[k][1] = 0
-
-        self.color_sequence = list(self.graph.edges)  # (伪随机的)染色顺序
-
-        for e1, e2 in tqdm(self.color_sequence):  # 比较黑白收益 执行染色
-            reward_w = update_W(self, e1, e2, "white")
-            reward_b = update_W(self, e1, e2, "black")
-            if reward_w < reward_b:
-                color_edge(e1, e2, "white")
-            else:
-                color_edge(e1, e2, "black")
+        self.K4_state.flush()
+        self.sequence_colors.flush()
+        temp = os.path.join(self.checkpoint_dir, "cursor.tmp")
+        with open(temp, "wb") as f:
+            np.save(f, np.array([self.n, self.cursor], dtype=np.int64))
+        os.replace(temp, os.path.join(self.checkpoint_dir, "cursor.npy"))
+
+    @classmethod
+    def resume(cls, path):
+        '''
+        从检查点恢复, 之后调用 coloring() 即从中断处继续
+        游标之后可能已有边记录了颜色但 K4 状态只更新了一部分, 状态只由颜色决定, 对这些边重新计算
+        '''
+        n, cursor = np.load(os.path.join(path, "cursor.npy")).tolist()
+        MK4 = cls(n)
+        MK4.color_sequence = list(MK4.graph.edges)
+        MK4.K4_state = np.load(os.path.join(path, "state.npy"), mmap_mode="r+")
+        MK4.sequence_colors = np.load(os.path.join(path, "colors.npy"), mmap_mode="r+")
+        MK4.checkpoint_dir = path
+        colored = MK4.sequence_colors >= 0
+        done = len(colored) if colored.all() else int(np.argmin(colored))  # 按顺序染色, 已染的是前缀
+        for (e1, e2), color in zip(MK4.color_sequence[:done], MK4.sequence_colors[:done].tolist()):
+            MK4.set_color(e1, e2, color)
+        for e1, e2 in MK4.color_sequence[cursor:done]:
+            MK4.refresh_K4_state(e1, e2)
+        MK4.cursor = done
+        return MK4
+
+    def add_vertex(self, coloring=True):
+        '''
+        增加一个顶点 n, 只追加包含它的 C(n, 3) 个 K4 和 n 条新边, 然后 (可选) 只对新边染色
+        按 colex 编号, 新 K4 {a<b<c<n} 的编号为 C(n,4) + C(a,1) + C(b,2) + C(c,3), 正好接在已有 K4 之后;
+        其初始状态由三角形 abc 已染的颜色决定
+        '''
+        if self.sparse or self.checkpoint_dir is not None:
+            raise ValueError("add_vertex is only available on complete graphs without checkpoints")
+        if not self.cursor:
+            self.color_sequence = list(self.graph.edges)
+        n = self.n
+        a, b, c = np.array(list(itertools.combinations(range(n), 3)), dtype=np.int64).reshape(-1, 3).T
+        C = self.color_matrix
+        new_state = np.zeros(math.comb(n, 3), dtype=np.int8)
+        new_state[a + b * (b - 1) // 2 + c * (c - 1) * (c - 2) // 6] = state_from_colors(np.stack((C[a, b], C[a, c], C[b, c])))
+        self.K4_state = np.concatenate((self.K4_state, new_state))
+
+        self.n = n + 1
+        self.binom = binomial_table(self.n)
+        self.K4_num = math.comb(self.n, 4)
+        self.pair_w, self.pair_x = np.triu_indices(self.n - 2, 1)
+        self.color_matrix = np.full((self.n, self.n), -1, dtype=np.int8)
+        self.color_matrix[:n, :n] = C
+        new_edges = [(i, n) for i in range(n)]
+        self.graph.add_edges_from(new_edges, color="None")
+        self.color_sequence += new_edges
+        if coloring:
+            self.coloring()
+
+    def set_color(self, e1, e2, color):
+        '''
+        记录边 (e1, e2) 的颜色编号
+        '''
+        self.graph[e1][e2]['color'] = COLORS[color]
+        if self.sparse:
+            self.edge_color[self.edge_id[(e1, e2)]] = color
+        else:
+            self.color_matrix[e1, e2] = self.color_matrix[e2, e1] = color
+
+    def local_search(self, time_limit=1.0, max_iterations=None, tabu=None):
+        '''
+        染色完成后用翻转局部搜索继续减少同色 K4, 返回搜索后的同色 K4 数
+        '''
+        if self.sparse:
+            raise ValueError("local_search is only available on complete graphs")
+        if (self.color_matrix[~np.eye(self.n, dtype=bool)] < 0).any():
+            raise ValueError("local_search requires every edge to be colored")
+        best, count = refine_coloring(self.color_matrix, time_limit, max_iterations, tabu)
+        changed = np.argwhere(np.triu(best != self.color_matrix, 1))
+        self.color_matrix = best
+        for e1, e2 in changed.tolist():
+            self.graph[e1][e2]['color'] = COLORS[best[e1, e2]]
+            self.refresh_K4_state(e1, e2)
+        return count
+
+    def refresh_K4_state(self, e1, e2):
+        '''
+        由当前颜色重新计算边 (e1, e2) 相关 K4 的状态: 已染边同色时为 ±已染边数, 否则 MIXED
+        '''
+        u, v = min(e1, e2), max(e1, e2)
+        others = np.delete(np.arange(self.n), [u, v])
+        w, x = others[self.pair_w], others[self.pair_x]
+        C = self.color_matrix
+        colors = np.stack((np.broadcast_to(C[u, v], w.shape), C[u, w], C[u, x], C[v, w], C[v, x], C[w, x]))
+        self.K4_state[self.related_K4(u, v)] = state_from_colors(colors)
 
     def draw_graph(self, label=False, legend=True):
         '''
@@ -130,18 +369,27 @@ class MonochromaticK4():
         #     plt.legend(handles=[patch1, patch2])
         return plt
 
-    def compute_k4(self):
+    def compute_k4(self, color_matrix=None, per_edge=False):
         '''
         计算同色K4的数量
+        color_matrix: 待评估的染色 (默认为当前染色)
+        per_edge: 同时返回每条边参与的同色K4数 (n×n 矩阵)
         '''
-        sum = 0
-        for i in range(len(self.K4_dict)):
-            colors = [self.graph[n1][n2]['color'] for n1, n2 in itertools.combinations(self.K4_dict[i][0], 2)]
-            result = colors.count(colors[0]) == len(colors)
-            if result:
-                sum += 1
-        return sum
+        if self.sparse:
+            return self.compute_sparse_k4(per_edge)
+        return count_k4(self.color_matrix if color_matrix is None else color_matrix, per_edge)
 
+    def compute_sparse_k4(self, per_edge=False):
+        '''
+        稀疏图模式下计算同色K4的数量, 直接检查列出的每个 K4
+        per_edge: 同时返回每条边 (按边编号) 参与的同色K4数
+        '''
+        colors = self.edge_color[self.K4_edges]
+        mono = (colors[:, 0] >= 0) & (colors == colors[:, :1]).all(axis=1)
+        sum = int(mono.sum())
+        if per_edge:
+            return sum, np.bincount(self.K4_edges[mono].ravel(), minlength=len(self.edge_color))
+        return sum
 
 if __name__ == '__main__':
     print("------------------------------------------------")
@@ -159,3 +407,9 @@ if __name__ == '__main__':
     expect_value = math.comb(node, 4) * (2 ** -5)
     sum = MK4.compute_k4()
     print('expect_value = ', expect_value, '\nsum = ', sum)
+    print('after local search = ', MK4.local_search(time_limit=1.0))
+
+    # 单色完全图的同色K4数应恰为 C(n,4), 检验大 n 时计数没有精度损失
+    white = np.zeros((500, 500), dtype=np.int8)
+    np.fill_diagonal(white, -1)
+    assert count_k4(white) == math.comb(500, 4)
@@ -0,0 +1,118 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Greedy Algorithm for Monochromatic K_s with r colors
+
+import math
+import itertools
+import numpy as np
+import networkx as nx
+from tqdm import tqdm
+
+class MonochromaticKs():
+    def __init__(self, nodes, s=4, r=2):
+        '''
+        定义完全图, 初始化数据结构
+        s: 团的大小; r: 颜色数, 颜色编号 0..r-1
+        '''
+        self.n = nodes
+        self.s = s
+        self.r = r
+        self.edges_per_clique = math.comb(s, 2)
+        self.graph = nx.complete_graph(nodes)
+
+        # --- K_s 状态 ---
+        # K_s 按组合数系统 (colex 序) 编号: {v_0<...<v_{s-1}} -> sum C(v_i, i+1)
+        # 每个 K_s 三个紧凑数组: 首色、已染边数、是否出现异色边 (dead)
+        # 已染 k 条同为首色的边时, 最终成为同色 K_s 的概率为 r^(k-E), E 为边数
+        # 以 r^(1-E) 为单位, 收益为整数 r^(k-1), 查表完成
+        self.binom = np.array([[math.comb(i, k) for i in range(nodes)] for k in range(s + 1)], dtype=np.int64)
+        self.Ks_num = math.comb(nodes, s)
+        self.first = np.full(self.Ks_num, -1, dtype=np.int8)  # 首色, -1 未染色
+        self.count = np.zeros(self.Ks_num, dtype=np.int8)  # 已染边数
+        self.dead = np.zeros(self.Ks_num, dtype=bool)  # 出现异色边, 不可能同色
+        self.weight = np.array([0] + [r ** (k - 1) for k in range(1, self.edges_per_clique + 1)], dtype=np.int64)
+        # 其余 n-2 个点中的 (s-2) 元子集, 每行升序
+        self.others_subsets = np.array(list(itertools.combinations(range(max(nodes - 2, 0)), s - 2)),
+                                       dtype=np.int64).reshape(-1, s - 2)
+
+        # --- 边 属性 ---
+        nx.set_edge_attributes(self.graph, "None", "color")
+        self.color_matrix = np.full((nodes, nodes), -1, dtype=np.int8)  # 边颜色编号矩阵, -1 未染色
+
+    def rank_Ks(self, nodes):
+        '''
+        K_s 顶点 -> 编号
+        '''
+        return sum(math.comb(node, k + 1) for k, node in enumerate(sorted(nodes)))
+
+    def unrank_Ks(self, rank):
+        '''
+        编号 -> K_s 顶点 (升序)
+        '''
+        nodes = []
+        for k in range(self.s, 0, -1):  # 从最大的顶点开始贪心确定
+            node = k - 1
+            while math.comb(node + 1, k) <= rank:
+                node += 1
+            nodes.append(node)
+            rank -= math.comb(node, k)
+        return tuple(reversed(nodes))
+
+    def related_Ks(self, e1, e2):
+        '''
+        边 (e1, e2) 相关的 C(n-2, s-2) 个 K_s 的编号
+        '''
+        u, v = min(e1, e2), max(e1, e2)
+        others = np.delete(np.arange(self.n), [u, v])[self.others_subsets]
+        # 每个顶点在升序 K_s 中的位置 = 比它小的顶点个数
+        pos_u = (others < u).sum(axis=1)
+        pos_v = 1 + (others < v).sum(axis=1)
+        pos_others = np.arange(self.s - 2) + (u < others) + (v < others)
+        binom = self.binom
+        return binom[pos_u + 1, u] + binom[pos_v + 1, v] + binom[pos_others + 1, others].sum(axis=1)
+
+    def coloring(self):
+        '''
+        条件期望染色: 每条边选使同色 K_s 期望数最小的颜色, 收益相同时取编号大的颜色
+        '''
+        self.color_sequence = list(self.graph.edges)  # (伪随机的)染色顺序
+
+        for e1, e2 in tqdm(self.color_sequence):
+            related = self.related_Ks(e1, e2)
+            first = self.first[related]
+            count = self.count[related]
+            alive = ~self.dead[related] & (count > 0)
+            # 染色为 c 的收益: 首色为 c 且仍可能同色的 K_s 的 r^(k-1) 之和
+            weight = self.weight[count]
+            rewards = [int(weight[alive & (first == c)].sum()) for c in range(self.r)]
+            color = self.r - 1 - int(np.argmin(rewards[::-1]))
+            self.graph[e1][e2]['color'] = color
+            self.color_matrix[e1, e2] = self.color_matrix[e2, e1] = color
+            # 更新相关 K_s 的状态
+            same = count == 0
+            self.first[related[same]] = color
+            same |= first == color
+            self.count[related[same]] = count[same] + 1
+            self.dead[related[~same]] = True
+
+    def compute_ks(self):
+        '''
+        计算同色 K_s 的数量
+        '''
+        return int((~self.dead & (self.count == self.edges_per_clique)).sum())
+
+    def expect_value(self):
+        '''
+        随机染色下同色 K_s 的期望数, 条件期望染色的结果不超过它
+        '''
+        return self.Ks_num * self.r ** (1 - self.edges_per_clique)
+
+
+if __name__ == '__main__':
+    print("------------------------------------------------")
+
+    for node, s, r in ((30, 4, 2), (30, 5, 2), (30, 4, 3)):
+        MKs = MonochromaticKs(node, s, r)
+        MKs.coloring()
+        print('K%d, %d colors, n = %d: expect_value = %.2f, sum = %d'
+              % (s, r, node, MKs.expect_value(), MKs.compute_ks()))
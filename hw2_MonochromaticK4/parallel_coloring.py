@@ -0,0 +1,112 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Sharded multi-process reward evaluation for the monochromatic K4 coloring
+
+from multiprocessing import Process, Pipe, Barrier, shared_memory
+from monochromatic_k4 import WEIGHT, NEXT_STATE, binomial_table, related_ranks
+import numpy as np
+
+_shared = {}  # 当前进程可见的共享数组 {名称: ndarray}
+_handles = []  # 工作进程中挂载的共享内存, 防止被回收
+
+def _attach(specs):
+    '''
+    工作进程初始化: 按名称挂载共享内存数组
+    '''
+    for key, (name, dtype, shape) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _handles.append(shm)
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _worker(conn, barrier, specs, n, lo, hi):
+    '''
+    工作进程: 负责其余点对编号在 [lo, hi) 内的 K4
+    每条消息 (color, edge): 先把上一条边的颜色 color 写入自己负责的 K4,
+    所有进程写完后 (barrier) 再计算 edge 在本分片上的黑白收益
+    '''
+    _attach(specs)
+    K4_state = _shared["K4_state"]
+    binom = binomial_table(n)
+    pair_w, pair_x = np.triu_indices(max(n - 2, 0), 1)
+    pair_w, pair_x = pair_w[lo:hi], pair_x[lo:hi]
+    related = state = None
+    while True:
+        color, edge = conn.recv()
+        if related is not None:
+            K4_state[related] = NEXT_STATE[color][state]
+        barrier.wait()  # 其他分片可能读到本分片刚写入的 K4
+        if edge is None:
+            break
+        u, v = min(edge), max(edge)
+        others = np.delete(np.arange(n), [u, v])
+        related = related_ranks(binom, u, v, others[pair_w], others[pair_x])
+        state = K4_state[related].view(np.uint8)
+        conn.send((int(WEIGHT[0][state].sum()), int(WEIGHT[1][state].sum())))
+    conn.send(None)
+    conn.close()
+
+
+class ShardedRewards():
+    def __init__(self, MK4, workers):
+        '''
+        把 K4 状态放入共享内存, 按其余点对 {w, x} 的编号把每条边的相关 K4 均分给 workers 个进程
+        收益为整数, 各分片求和的结果与单进程完全相同
+        MK4: MonochromaticK4, 退出时把最终状态写回 MK4.K4_state
+        '''
+        self.MK4 = MK4
+        self.shm = shared_memory.SharedMemory(create=True, size=max(MK4.K4_state.nbytes, 1))
+        _shared["K4_state"] = np.ndarray(MK4.K4_state.shape, dtype=np.int8, buffer=self.shm.buf)
+        _shared["K4_state"][:] = MK4.K4_state
+        specs = {"K4_state": (self.shm.name, np.int8, MK4.K4_state.shape)}
+
+        cuts = np.linspace(0, len(MK4.pair_w), workers + 1).astype(np.int64).tolist()
+        barrier = Barrier(workers)
+        self.conns = []
+        self.processes = []
+        for lo, hi in zip(cuts[:-1], cuts[1:]):
+            parent, child = Pipe()
+            process = Process(target=_worker, args=(child, barrier, specs, MK4.n, lo, hi), daemon=True)
+            process.start()
+            self.conns.append(parent)
+            self.processes.append(process)
+        self.color = None  # 上一条边的颜色, 随下一条消息发出
+
+    def rewards(self, e1, e2):
+        '''
+        边 (e1, e2) 染白、染黑的收益 (汇总各分片)
+        '''
+        for conn in self.conns:
+            conn.send((self.color, (e1, e2)))
+        reward_w = reward_b = 0
+        for conn in self.conns:
+            w, b = conn.recv()
+            reward_w += w
+            reward_b += b
+        return reward_w, reward_b
+
+    def commit(self, color):
+        '''
+        确定刚计算过收益的边的颜色, 与下一条边一起广播
+        '''
+        self.color = color
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if exc[0] is None:  # 写入最后一条边并结束工作进程
+                for conn in self.conns:
+                    conn.send((self.color, None))
+                for conn in self.conns:
+                    conn.recv()
+                self.MK4.K4_state[:] = _shared["K4_state"]
+        finally:
+            for process in self.processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+            _shared.clear()
+            self.shm.close()
+            self.shm.unlink()
+        return False
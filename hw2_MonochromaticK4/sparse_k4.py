@@ -0,0 +1,62 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Degeneracy-ordered K4 listing for monochromatic K4 coloring on sparse graphs
+
+import heapq
+import itertools
+import numpy as np
+
+def degeneracy_order(adj):
+    '''
+    每次删去剩余度最小的点 (惰性堆), 返回每个点在删除序列中的位置
+    按此顺序定向后每个点的出度不超过图的退化度
+    '''
+    n = len(adj)
+    degree = [len(neighbors) for neighbors in adj]
+    heap = [(d, v) for v, d in enumerate(degree)]
+    heapq.heapify(heap)
+    position = [-1] * n
+    for k in range(n):
+        while True:
+            d, v = heapq.heappop(heap)
+            if position[v] < 0 and d == degree[v]:  # 跳过过期的堆项
+                break
+        position[v] = k
+        for w in adj[v]:
+            if position[w] < 0:
+                degree[w] -= 1
+                heapq.heappush(heap, (degree[w], w))
+    return position
+
+def list_K4(n, edges):
+    '''
+    列出图中所有 K4
+    edges: 边列表 (u, v), 下标即边的编号
+    返回 (K4_edges, indptr, edge_K4):
+    K4_edges[k]: 第 k 个 K4 的 6 条边的编号;
+    边 e 所在的 K4 为 edge_K4[indptr[e]:indptr[e+1]]
+    '''
+    edge_id = {}
+    adj = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(edges):
+        edge_id[(u, v)] = edge_id[(v, u)] = e
+        adj[u].append(v)
+        adj[v].append(u)
+    position = degeneracy_order(adj)
+    out = [{w for w in adj[v] if position[w] > position[v]} for v in range(n)]  # 按删除顺序定向
+
+    K4_edges = []
+    for u in range(n):
+        for v in out[u]:
+            common = out[u] & out[v]
+            for w in common:
+                for x in common & out[w]:
+                    K4_edges.append([edge_id[pair] for pair in itertools.combinations((u, v, w, x), 2)])
+    K4_edges = np.array(K4_edges, dtype=np.int64).reshape(-1, 6)
+
+    # 边 -> K4 的 CSR 索引
+    owner = K4_edges.ravel()
+    edge_K4 = np.argsort(owner, kind="stable") // 6
+    indptr = np.zeros(len(edges) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=len(edges)), out=indptr[1:])
+    return K4_edges, indptr, edge_K4
@@ -3,180 +3,311 @@
 # Description: a hill-climbing algorithm for constructing random STS(v)
 
 import itertools
+from array import array
 import networkx as nx
 import matplotlib.pyplot as plt
 from tqdm import tqdm
 from hypergraph_visualization import *
+from STS_algebraic import algebraic_sts
+from hypergraph import Hypergraph
 
 class STS():
-    def __init__(self, node_num, tqdm_bar=True, monitor=False):
+    def __init__(self, node_num, tqdm_bar=True, monitor=False, engine="legacy", seed=None,
+                 warm_start=False, perturb=None, record=None, record_steps=None, record_seconds=None):
         """
         node_num: 节点数量
         monitor: 是否开启实时渲染
+        engine: "legacy" 原始的逐步扫描实现 (默认); "stinson" 数组实现的 Stinson 爬山法, 每步期望 O(1);
+                "algebraic" 确定性的 Bose (v%6==3) / Skolem (v%6==1) 构造, O(v^2)
+        seed: 随机种子, stinson 与 legacy 引擎都从 self.rng 取随机数, 给定时结果可复现;
+              为 None 时直接使用 random 模块, 与原实现一样随 random.seed 复现
+        warm_start: stinson 引擎从随机重新编号的代数构造出发, 随机删去 perturb 个区组 (默认 1/10) 后爬山补全
+        record: 离屏录制构造过程的文件 (.gif / .mp4), 每 record_steps 步或 record_seconds 秒录一帧, 都不给时每秒一帧
         """
         self.tqdm_bar = tqdm_bar
         self.monitor = monitor
+        self.recorder = None
+        self.rng = random.Random(seed) if seed is not None else random
+        self.hypergraph = None  # Hypergraph 形式的结果, 画图时再转为 star expansion
         if node_num % 6 == 1 or node_num % 6 == 3:
             self.n = node_num
-            self.construct()
+            if record is not None:
+                self.recorder = HypergraphRecorder(node_num, record, record_steps, record_seconds)
+            if engine == "stinson" and warm_start:
+                self.construct_stinson(self.perturbed_algebraic_blocks(perturb))
+            elif engine == "stinson":
+                self.construct_stinson()
+            elif engine == "algebraic":
+                self.blocks = algebraic_sts(self.n)
+                self.other = self.pairs_from_blocks(self.blocks)
+                self.hypergraph = Hypergraph.from_edges(self.n, self.blocks)
+                self.edge_num_history = [len(self.blocks)]
+                if self.recorder is not None:
+                    self.recorder.close(1, self.blocks)
+            elif engine in ("legacy", "networkx"):
+                self.construct()
+            else:
+                raise ValueError("Unknown engine: " + str(engine))
         else:
             raise ValueError("Wrong node number! v must satisfy v%6==1 or v%6==3.")
 
-    def graph_add_hyper_neighbors(self):
-        """
-        为超图中每个节点创建邻居集合 (点-边-点)
-        集合中会包含节点自身, 计算度时注意 -1
-        注意需要在添加完所有顶点后执行
-        """
-        nx.set_node_attributes(self.G, None, "neighbors")  #TODO: list 和 set 都需要单独赋值, dict 不用
-        for node in [node for node in list(self.G.nodes)
-                            if node[:4] == 'node']:  # 遍历所有节点
-            self.G.nodes[node]['neighbors'] = {node}  # 赋初始集合
-
-    def update_nodes_neighbor(self):
-        """
-        遍历超边, 计算超图顶点的度
-        n.b. 两条不同的超边连接A、B时, 节点度计算一次
-        """
-        for node in [node for node in list(self.G.nodes)
-                            if node[:4] == 'node']:  # 遍历所有节点
-            self.G.nodes[node]['neighbors'] = {node}  # 清空邻居 (针对switch操作)
-        for hyper_edge in list(self.G.nodes):
-            if hyper_edge[:4] == 'edge':  # 遍历超边
-                connected_nodes = list(self.G.adj[hyper_edge])  # 超边连接的所有点
-                for i,j in list(itertools.permutations(connected_nodes, 2)):
-                    self.G.nodes[i]['neighbors'].add(j)
-
     def construct(self):
         '''
-        爬山法构造 STS(v)
+        爬山法构造 STS(v), 原始的逐步扫描实现, 超图存放在 Hypergraph 中
         '''
-        self.G = nx.Graph()
-        hyper_node = []  # 超图中的点
-        hyper_edge = []  # 超图中的边
-        for i in range(self.n):  # 创建所有节点
-            self.G.add_node('node'+str(i))
-            hyper_node.append('node'+str(i))
-        self.graph_add_hyper_neighbors()
+        H = Hypergraph(self.n)
+        self.hypergraph = H
+        hyper_node = list(range(self.n))  # 超图中的点
         edge_num_target = self.n*(self.n-1)/6  # 最优条件
         self.edge_num_history = []  # 记录每次循环后超边数量
 
-        def find_live_points(graph):
+        def find_live_points():
             """
             寻找度小于 (node_num-1)/2 的点
             """
-            live_points = []
-            for node in hyper_node:
-                if len(graph.adj[node]) < (self.n-1)/2:
-                # if len(graph.nodes[node]['neighbors'])-1 < self.n-1:  # 两种写法等价
-                    live_points.append(node)
-            return live_points
-
-        def find_live_pairs(graph, live_points):
+            return [node for node in hyper_node if H.degree(node) < (self.n-1)/2]
+
+        def find_live_pairs(live_points):
             """
             寻找live_points中未相互连接的点对
             """
+            neighbors = {node: H.neighbors(node) for node in live_points}
             live_pairs = []
             for p, q in list(itertools.combinations(live_points, 2)):
-                if q not in graph.nodes[p]['neighbors']:
+                if q not in neighbors[p]:
                     live_pairs.append((p, q))
-            all_points = list(set([node for pair in live_pairs for node in pair]))  # 一种丧失了可读性的漂亮代码 和下一行等价                            
-            # all_points = list(set([point[0] for point in live_pairs]
-            #                     + [point[1] for point in live_pairs]))
+            all_points = list(set([node for pair in live_pairs for node in pair]))
             return live_pairs, all_points
 
         def find_live_block(live_pairs, all_points):
             """
             寻找live_pairs中可行的block
             """
-            # 当做图来处理, 寻找3-集团, 但效率非常低
-            # G = nx.Graph()
-            # G.add_edges_from(live_pairs)
-            # live_blocks = [c for c in nx.enumerate_all_cliques(G) if len(c)==3]
-            # return live_blocks
-            
-            live_pairs_copy = live_pairs.copy()
-            while live_pairs_copy:
-                first_edge = random.choice(live_pairs_copy)
+            live_pairs_copy = set(live_pairs)
+            candidates = live_pairs.copy()
+            while candidates:
+                first_edge = self.rng.choice(candidates)
                 a, b = first_edge
                 for c in all_points:
                     if ((a,c) in live_pairs_copy or (c,a) in live_pairs_copy) \
                         and ((b,c) in live_pairs_copy or (c,b) in live_pairs_copy):
                         return (a,b,c)
-                live_pairs_copy.remove(first_edge)
+                candidates.remove(first_edge)
             return 0
-        
-        def switch_block(graph, live_pairs, all_points):
+
+        def switch_block(live_pairs, all_points):
             """
             无法新增的情况下进行随机替换
             """
-            first_edge = random.choice(live_pairs)
-            if random.randint(0,1) == 0:  # 保证随机性, 注意下文ab并不等价
+            first_edge = self.rng.choice(live_pairs)
+            if self.rng.randint(0,1) == 0:  # 保证随机性, 注意下文ab并不等价
                 a, b = first_edge
             else:
                 b, a = first_edge
+            live_pairs_set = set(live_pairs)
             for c in all_points:
-                if ((a,c) in live_pairs or (c,a) in live_pairs)\
+                if ((a,c) in live_pairs_set or (c,a) in live_pairs_set)\
                     and b!=c:                               # 随意选择可行的 (a,b) 和 (a,c)
-                    for edge in hyper_edge:
-                        if b in list(graph.adj[edge]) and c in list(graph.adj[edge]):
-                            l = list(graph.adj[edge])
-                            l.remove(b)
-                            l.remove(c)                            
-                            graph.remove_edge(edge, l[0])   # 删除原来的(x,b,c), 添加 (a,b,c)
-                            graph.add_edge(edge, a)
-                            # print(l[0], b, c, "→", a, b, c)
+                    for edge in H.incident_edges(b):
+                        if c in H.edge(edge):
+                            H.replace_edge(edge, (a, b, c))  # 删除原来的(x,b,c), 添加 (a,b,c)
                             return
             print("FUCKED UP")  # 一般是出问题了
 
-
-
         # 开始构造
         if self.tqdm_bar:
             tqdm_bar = tqdm(total=edge_num_target)  # 进度条控制
         if self.monitor:
-            self.hyper_node_layout = nx.circular_layout(self.G)  # 超图节点环形分布
             fig = plt.figure()  # 生成画布
             plt.ion()  # 打开交互模式
-        while len(hyper_edge) < edge_num_target:
-            self.update_nodes_neighbor()
-            live_points = find_live_points(self.G)                        # 寻找未连接满的顶点
-            live_pairs, all_points = find_live_pairs(self.G, live_points)   # 寻找可行的连接对
+        while H.number_of_edges() < edge_num_target:
+            live_points = find_live_points()                        # 寻找未连接满的顶点
+            live_pairs, all_points = find_live_pairs(live_points)   # 寻找可行的连接对
             live_blocks = find_live_block(live_pairs, all_points)   # 寻找可行的超边
             if live_blocks:                             # 有可行的超边
-                new_edge_name = 'edge'+str(len(hyper_edge))
-                self.G.add_node(new_edge_name)           # 新增超边
-                hyper_edge.append(new_edge_name)
-                for i in live_blocks:
-                    self.G.add_edge(new_edge_name, i)    # 连接所有顶点
+                H.add_edge(live_blocks)                 # 新增超边
                 if self.tqdm_bar:
                     tqdm_bar.update(1)  # 进度条控制
             else:                                       # 没有可行的超边
-                switch_block(self.G, live_pairs, all_points)
+                switch_block(live_pairs, all_points)
             if self.monitor:
                 fig.clf()
-                self.update_gif(hyper_node, self.hyper_node_layout)
+                self.update_gif(hyper_node, self.hyper_node_layout())
                 plt.pause(0.01)
-            self.edge_num_history.append(len(hyper_edge))  # 记录每次循环后超边数量
+            self.edge_num_history.append(H.number_of_edges())  # 记录每次循环后超边数量
+            if self.recorder is not None and self.recorder.due(len(self.edge_num_history)):
+                self.recorder.frame(len(self.edge_num_history), [edge for _, edge in H.edges()])
         # 完成构造
         if self.tqdm_bar:
             tqdm_bar.close()  # 进度条控制
         if self.monitor:
             plt.ioff()  # 关闭交互模式
             plt.show()
+        self.blocks = sorted(tuple(sorted(edge)) for _, edge in H.edges())
+        if self.recorder is not None:
+            self.recorder.close(len(self.edge_num_history), self.blocks)
+
+    def perturbed_algebraic_blocks(self, perturb=None):
+        '''
+        随机重新编号的代数构造, 随机删去 perturb 个区组
+        '''
+        blocks = algebraic_sts(self.n)
+        label = list(range(self.n))
+        self.rng.shuffle(label)
+        blocks = [tuple(label[p] for p in block) for block in blocks]
+        perturb = len(blocks) // 10 if perturb is None else min(perturb, len(blocks))
+        self.rng.shuffle(blocks)
+        return blocks[perturb:]
+
+    def pairs_from_blocks(self, blocks):
+        '''
+        区组 -> other 数组 (点对的第三个点, -1 表示未覆盖)
+        '''
+        v = self.n
+        other = array('i', [-1]) * (v * v)
+        for x, y, z in blocks:
+            other[x * v + y] = other[y * v + x] = z
+            other[x * v + z] = other[z * v + x] = y
+            other[y * v + z] = other[z * v + y] = x
+        return other
+
+    def construct_stinson(self, initial_blocks=()):
+        '''
+        Stinson 爬山法构造 STS(v), 每步期望 O(1)
+        other[x*v+y]: 包含点对 {x,y} 的区组的第三个点, -1 表示未覆盖
+        live[x]: 与 x 尚未被区组覆盖的点 (live 邻居), position[x*v+y] 为 y 在 live[x] 中的位置, 用于 O(1) 删除
+        live_points: live 邻居非空的点, 同样按位置交换删除
+        每步随机取 live 点 x 与其两个 live 邻居 y, z:
+        {y,z} 未覆盖时加入区组 {x,y,z}; 否则用 {x,y,z} 替换包含 {y,z} 的区组 {w,y,z}
+        initial_blocks: 初始的部分区组 (两两不含相同点对)
+        '''
+        v = self.n
+        uniform = self.rng.random  # int(uniform() * k) 比 randrange(k) 快
+        other = self.pairs_from_blocks(initial_blocks)
+        live = [[y for y in range(v) if y != x and other[x * v + y] < 0] for x in range(v)]
+        position = array('i', [-1]) * (v * v)
+        for x in range(v):
+            for k, y in enumerate(live[x]):
+                position[x * v + y] = k
+        live_points = [x for x in range(v) if live[x]]
+        point_position = [-1] * v
+        for k, x in enumerate(live_points):
+            point_position[x] = k
+
+        def remove_live(a, b):  # 从 live[a] 中删除 b
+            neighbors = live[a]
+            last = neighbors.pop()
+            if last != b:
+                k = position[a * v + b]
+                neighbors[k] = last
+                position[a * v + last] = k
+            if not neighbors:  # a 不再是 live 点
+                last = live_points.pop()
+                if last != a:
+                    live_points[point_position[a]] = last
+                    point_position[last] = point_position[a]
+
+        def add_live(a, b):  # 把 b 加回 live[a]
+            neighbors = live[a]
+            if not neighbors:
+                point_position[a] = len(live_points)
+                live_points.append(a)
+            position[a * v + b] = len(neighbors)
+            neighbors.append(b)
+
+        edge_num_target = v * (v - 1) // 6
+        block_num = len(initial_blocks)
+        self.edge_num_history = []  # 记录每次循环后区组数量
+        if self.tqdm_bar:
+            tqdm_bar = tqdm(total=edge_num_target, initial=block_num)
+        if self.monitor:
+            fig = plt.figure()
+            plt.ion()
+        while block_num < edge_num_target:
+            x = live_points[int(uniform() * len(live_points))]
+            neighbors = live[x]
+            i = int(uniform() * len(neighbors))
+            j = int(uniform() * (len(neighbors) - 1))
+            j += j >= i
+            y, z = neighbors[i], neighbors[j]
+            w = other[y * v + z]
+            if w < 0:  # 新增区组, {y,z} 被覆盖
+                block_num += 1
+                remove_live(y, z)
+                remove_live(z, y)
+                if self.tqdm_bar:
+                    tqdm_bar.update(1)
+            else:  # 替换区组 {w,y,z}, {w,y} 与 {w,z} 不再被覆盖
+                other[w * v + y] = other[y * v + w] = -1
+                other[w * v + z] = other[z * v + w] = -1
+                add_live(w, y)
+                add_live(y, w)
+                add_live(w, z)
+                add_live(z, w)
+            # {x,y} 与 {x,z} 被覆盖
+            remove_live(x, y)
+            remove_live(y, x)
+            remove_live(x, z)
+            remove_live(z, x)
+            other[x * v + y] = other[y * v + x] = z
+            other[x * v + z] = other[z * v + x] = y
+            other[y * v + z] = other[z * v + y] = x
+            if self.monitor:
+                self.other = other
+                self.hypergraph = Hypergraph.from_edges(v, self.blocks_from_pairs())
+                fig.clf()
+                self.update_gif(list(range(v)), self.hyper_node_layout())
+                plt.pause(0.01)
+            self.edge_num_history.append(block_num)
+            if self.recorder is not None and self.recorder.due(len(self.edge_num_history)):
+                self.other = other
+                self.recorder.frame(len(self.edge_num_history), self.blocks_from_pairs())
+        if self.tqdm_bar:
+            tqdm_bar.close()
+        if self.monitor:
+            plt.ioff()
+            plt.show()
+        self.other = other
+        self.blocks = self.blocks_from_pairs()
+        self.hypergraph = Hypergraph.from_edges(v, self.blocks)
+        if self.recorder is not None:
+            self.recorder.close(len(self.edge_num_history), self.blocks)
+
+    def blocks_from_pairs(self):
+        '''
+        由 other 数组列出所有区组 (升序三元组), O(v^2)
+        '''
+        v = self.n
+        other = self.other
+        return [(x, y, other[x * v + y]) for x in range(v) for y in range(x + 1, v)
+                if other[x * v + y] > y]
+
+    def star_expansion(self):
+        '''
+        超图的 star expansion 形式, 仅在画图时生成
+        '''
+        return self.hypergraph.star_expansion()
+
+    def hyper_node_layout(self):
+        '''
+        超图节点环形分布, 只计算一次
+        '''
+        if getattr(self, "_hyper_node_layout", None) is None:
+            self._hyper_node_layout = nx.circular_layout(range(self.n))
+        return self._hyper_node_layout
 
     def update_gif(self, node, node_pos):
         """
         更新构建过程截图 节点固定位置 超边随机分布
         """
-        draw_hypergraph(self.G, fixed_node=(node, node_pos))
+        draw_hypergraph(self.hypergraph, fixed_node=(node, node_pos))
 
     def draw(self):
         """
         绘制图形 节点、超边随机分布
         """
         fig, ax = plt.subplots()
-        draw_hypergraph(self.G)
+        draw_hypergraph(self.hypergraph)
         plt.show()
 
     def draw_history(self):
@@ -0,0 +1,55 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Direct Bose and Skolem constructions of STS(v)
+
+def bose_sts(v):
+    '''
+    Bose 构造, v = 6n+3
+    点 (x, i) -> x + i*m, x ∈ Z_m (m = 2n+1), i ∈ Z_3
+    交换幂等拟群 x∘y = (x+y)/2 mod m
+    区组: {(x,0),(x,1),(x,2)}; x < y 时 {(x,i),(y,i),(x∘y,i+1)}
+    '''
+    if v % 6 != 3:
+        raise ValueError("Bose construction needs v%6==3.")
+    m = v // 3
+    half = (m + 1) // 2  # 2 在 Z_m 中的逆元
+    blocks = [(x, x + m, x + 2 * m) for x in range(m)]
+    for i in range(3):
+        j = (i + 1) % 3
+        for x in range(m):
+            for y in range(x + 1, m):
+                blocks.append((x + i * m, y + i * m, (x + y) * half % m + j * m))
+    return sorted(tuple(sorted(block)) for block in blocks)
+
+def skolem_sts(v):
+    '''
+    Skolem 构造, v = 6n+1
+    点 (x, i) -> x + i*2n, x ∈ Z_2n, i ∈ Z_3, 另有 ∞ -> v-1
+    半幂等交换拟群 x∘y = σ((x+y) mod 2n), σ(k) = k/2 (k 偶), (k-1)/2 + n (k 奇)
+    区组: x < n 时 {(x,0),(x,1),(x,2)} 与 {∞,(x+n,i),(x,i+1)}; x < y 时 {(x,i),(y,i),(x∘y,i+1)}
+    '''
+    if v % 6 != 1:
+        raise ValueError("Skolem construction needs v%6==1.")
+    n = v // 6
+    m = 2 * n
+    infinity = v - 1
+
+    def product(x, y):
+        k = (x + y) % m
+        return k // 2 if k % 2 == 0 else (k - 1) // 2 + n
+
+    blocks = [(x, x + m, x + 2 * m) for x in range(n)]
+    for i in range(3):
+        j = (i + 1) % 3
+        for x in range(n):
+            blocks.append((infinity, x + n + i * m, x + j * m))
+        for x in range(m):
+            for y in range(x + 1, m):
+                blocks.append((x + i * m, y + i * m, product(x, y) + j * m))
+    return sorted(tuple(sorted(block)) for block in blocks)
+
+def algebraic_sts(v):
+    '''
+    按 v mod 6 选择 Bose 或 Skolem 构造
+    '''
+    return bose_sts(v) if v % 6 == 3 else skolem_sts(v)
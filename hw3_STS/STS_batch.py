@@ -0,0 +1,115 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Batch generation of random STS(v) over a process pool with streamed output
+
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from multiprocessing import Pool
+from tqdm import tqdm
+from STS_HillClimbing import STS
+from STS_invariants import validate_sts, count_pasch
+
+BATCH_MAGIC = b"STSBATCH"  # 二进制文件头: 魔数 + v + 点编号字节数, 共 24 字节
+
+def _build(task):
+    '''
+    工作进程: 用独立的随机种子构造一个 STS(v), 校验后 (可选) 计算 Pasch 数
+    '''
+    v, index, entropy, engine, pasch = task
+    seed = int(np.random.SeedSequence(entropy, spawn_key=(index,)).generate_state(1, np.uint64)[0])
+    sts = STS(v, tqdm_bar=False, engine=engine, seed=seed)
+    if not validate_sts(v, sts.blocks):
+        raise ValueError(f"Invalid STS({v}) generated with seed {seed}")
+    return index, seed, sts.blocks, count_pasch(v, sts.blocks) if pasch else -1
+
+def generate_batch(v, count, seed=0, workers=None, engine="stinson", pasch=False):
+    '''
+    并行构造 count 个随机 STS(v), 按完成顺序逐个产出 (编号, 种子, 区组列表, Pasch 数)
+    第 index 个系统的种子由 SeedSequence(seed, spawn_key=(index,)) 派生 (与 SeedSequence(seed).spawn 的第 index 个相同),
+    在工作进程中按需生成, 互相独立且与进程数无关, 内存与启动时间不随 count 增长
+    pasch: 是否计算 Pasch 数 (不计算时为 -1)
+    '''
+    entropy = np.random.SeedSequence(seed).entropy
+    tasks = ((v, index, entropy, engine, pasch) for index in range(count))
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        yield from map(_build, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_build, tasks)
+
+def write_batch(path, v, results, format="jsonl"):
+    '''
+    流式写出结果, 内存占用与系统个数无关
+    jsonl: 每行 {"index", "seed", "pasch", "blocks"}
+    binary: 文件头后每个系统一条记录: index (int64), seed (uint64), pasch (int64), v(v-1)/6 个区组的点编号
+    '''
+    dtype = np.uint16 if v < 1 << 16 else np.uint32
+    written = 0
+    with open(path, "w" if format == "jsonl" else "wb") as f:
+        if format == "binary":
+            f.write(BATCH_MAGIC)
+            np.array([v, np.dtype(dtype).itemsize], dtype=np.int64).tofile(f)
+        for index, seed, blocks, pasch in results:
+            if format == "jsonl":
+                f.write(json.dumps({"index": index, "seed": seed, "pasch": pasch, "blocks": blocks}) + "\n")
+            else:
+                np.array([index], dtype=np.int64).tofile(f)
+                np.array([seed], dtype=np.uint64).tofile(f)
+                np.array([pasch], dtype=np.int64).tofile(f)
+                np.asarray(blocks, dtype=dtype).tofile(f)
+            written += 1
+    return written
+
+def read_batch(path):
+    '''
+    逐个读取 write_batch 写出的系统, 产出 (编号, 种子, 区组列表, Pasch 数)
+    '''
+    with open(path, "rb") as f:
+        if f.read(8) != BATCH_MAGIC:
+            f.seek(0)
+            for line in f:
+                record = json.loads(line)
+                yield (record["index"], record["seed"], [tuple(block) for block in record["blocks"]],
+                       record["pasch"])
+            return
+        v, itemsize = np.fromfile(f, dtype=np.int64, count=2).tolist()
+        dtype = np.dtype("uint%d" % (8 * itemsize))
+        size = v * (v - 1) // 6 * 3
+        while True:
+            index = np.fromfile(f, dtype=np.int64, count=1)
+            if not len(index):
+                break
+            seed = np.fromfile(f, dtype=np.uint64, count=1)
+            pasch = np.fromfile(f, dtype=np.int64, count=1)
+            blocks = np.fromfile(f, dtype=dtype, count=size).reshape(-1, 3)
+            yield int(index[0]), int(seed[0]), [tuple(block) for block in blocks.tolist()], int(pasch[0])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate many random STS(v) in parallel")
+    parser.add_argument("v", type=int, help="number of points, v %% 6 == 1 or 3")
+    parser.add_argument("count", type=int, help="number of systems")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--engine", default="stinson", choices=("stinson", "legacy"))
+    parser.add_argument("--format", default="jsonl", choices=("jsonl", "binary"))
+    parser.add_argument("--pasch", action="store_true", help="record the Pasch count of each system")
+    parser.add_argument("--distinct-pasch", action="store_true",
+                        help="keep only the first system for each Pasch count (implies --pasch)")
+    parser.add_argument("-o", "--output", default=None, help="output file (default: STS_<v>_<count>.<format>)")
+    args = parser.parse_args()
+    if args.v % 6 not in (1, 3):
+        sys.exit("Wrong node number! v must satisfy v%6==1 or v%6==3.")
+
+    output = args.output or f"STS_{args.v}_{args.count}.{'jsonl' if args.format == 'jsonl' else 'bin'}"
+    pasch = args.pasch or args.distinct_pasch
+    results = tqdm(generate_batch(args.v, args.count, args.seed, args.workers, args.engine, pasch), total=args.count)
+    if args.distinct_pasch:  # Pasch 数不同的系统一定不同构
+        seen = set()
+        results = (result for result in results if not (result[3] in seen or seen.add(result[3])))
+    written = write_batch(output, args.v, results, args.format)
+    print(f"Wrote {written} STS({args.v}) to {output}")
@@ -0,0 +1,68 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Fast STS(v) validator and Pasch-configuration counter
+
+import numpy as np
+
+def pair_coverage(v, blocks):
+    '''
+    区组覆盖的点对 (v×v 布尔矩阵, 上三角) 与其中被覆盖的点对个数
+    blocks: 三元组列表, 点编号 0..v-1, 每个区组内已升序
+    '''
+    blocks = np.asarray(blocks, dtype=np.int64).reshape(-1, 3)
+    covered = np.zeros((v, v), dtype=bool)
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        covered[blocks[:, i], blocks[:, j]] = True
+    return covered, int(np.count_nonzero(covered))
+
+def validate_sts(v, blocks):
+    '''
+    O(v^2) 检查 blocks 是否为 STS(v): 区组数为 v(v-1)/6, 每个区组 3 个不同的点, 每个点对恰好被覆盖一次
+    区组数正确时, 3·区组数个点对互不相同即覆盖全部 v(v-1)/2 个点对
+    '''
+    blocks = np.asarray(blocks, dtype=np.int64).reshape(-1, 3)
+    if len(blocks) != v * (v - 1) // 6:
+        return False
+    if len(blocks) and (blocks.min() < 0 or blocks.max() >= v):
+        return False
+    ordered = np.sort(blocks, axis=1)
+    if ((ordered[:, 0] == ordered[:, 1]) | (ordered[:, 1] == ordered[:, 2])).any():
+        return False
+    return pair_coverage(v, ordered)[1] == 3 * len(blocks)
+
+def third_point_table(v, blocks):
+    '''
+    点对 -> 第三个点的表 T (v×v), T[a, b] = c 当且仅当 {a, b, c} 为区组, 对角线为 -1
+    '''
+    blocks = np.asarray(blocks, dtype=np.int64).reshape(-1, 3)
+    T = np.full((v, v), -1, dtype=np.int16 if v < 1 << 15 else np.int32)
+    for i, j, k in ((0, 1, 2), (0, 2, 1), (1, 2, 0)):
+        T[blocks[:, i], blocks[:, j]] = blocks[:, k]
+        T[blocks[:, j], blocks[:, i]] = blocks[:, k]
+    return T
+
+def count_pasch(v, blocks, T=None):
+    '''
+    Pasch 构型 (四边形: 6 个点上的 4 个区组, 两两相交) 的个数
+    过点 x 的区组把其余点配成完美匹配 M (令 M[x] = x); 两个过 x 的区组 {x,a,M a}, {x,c,M c}
+    与另两个区组构成 Pasch 当且仅当 T[a, c] == T[M a, M c], 因此逐点比较 T 与 T[M][:, M]
+    每个 Pasch 的 6 对区组各在交点处贡献 2 个命中 (只取 a < M a 的行), 共 12 次;
+    每行的对角线与 c = M a 两处为恒成立的假命中, 逐点扣除
+    '''
+    if T is None:
+        T = third_point_table(v, blocks)
+    hits = 0
+    for x in range(v):
+        M = T[x].astype(np.int64)
+        M[x] = x
+        rows = np.flatnonzero(M > np.arange(v))  # 每个过 x 的区组取一行
+        hits += int(np.count_nonzero(T[rows] == T[np.ix_(M[rows], M)])) - 2 * len(rows)
+    return hits // 12
+
+
+if __name__ == '__main__':
+    fano = [(0, 1, 2), (0, 3, 4), (0, 5, 6), (1, 3, 5), (1, 4, 6), (2, 3, 6), (2, 4, 5)]
+    affine = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8),
+              (0, 4, 8), (1, 5, 6), (2, 3, 7), (0, 5, 7), (1, 3, 8), (2, 4, 6)]
+    print('STS(7):', validate_sts(7, fano), count_pasch(7, fano))  # True 7
+    print('STS(9):', validate_sts(9, affine), count_pasch(9, affine))  # True 0
@@ -1,72 +1,78 @@
 # 爬山法求解STS(v)
 # by Qu Chendi
-import numpy as np
 import random
 import matplotlib.pyplot as plt
 import time
+from array import array
 
-v = 145
-X = np.array(range(1, v + 1))
-B = []
-block_num = 0  # 三元组个数
-live_num = np.zeros(v)  # 每个数出现的次数
-x_matrix = np.eye(v)  # 0-1矩阵，若点i,j在B的一个三元组中出现过，(i,j)=(j,i)=1
-# bn_list = []
-# bn_list.append(block_num)
-time_start = time.time()
-while block_num < (v - 1) * v / 6:
-    # SWITCH
-    live_id = np.where(live_num < (v - 1) / 2)[0].tolist()
-    live_point = X[live_id]  # 更新live_point list
-    point = random.choice(live_point)  # 随机取一个
-    live_pair = X[np.where(x_matrix[point - 1, :] == 0)[0].tolist()]  # 找出没有相遇过的点
-    pair = random.sample(list(live_pair), 2)  # 随机取两个组成live_pair
 
-    if x_matrix[pair[0] - 1, pair[1] - 1] == 0:  # 另外两个数未相遇过，直接添加
-        B.append([point, pair[0], pair[1]])
+def sts_qcd(v, seed=None):
+    '''
+    爬山法构造 STS(v), 返回三元组列表 B (点编号 1..v)
+    block_of[i*v+j]: 包含点对 (i,j) 的三元组编号, -1 表示未相遇
+    live / unmet[i]: live 点与每个点尚未相遇的点, 均按位置交换删除, 每步 O(1)
+    '''
+    rng = random.Random(seed)
+    B = []  # 三元组, 点编号 0..v-1
+    block_of = array('i', [-1]) * (v * v)
+    unmet = [[j for j in range(v) if j != i] for i in range(v)]
+    unmet_pos = array('i', [j - (j > i) if j != i else -1 for i in range(v) for j in range(v)])
+    live = list(range(v))  # 每个数出现的次数 < (v-1)/2 的点
+    live_pos = list(range(v))
 
-        block_num += 1
-        live_num[point - 1] += 1
-        live_num[pair[0] - 1] += 1
-        live_num[pair[1] - 1] += 1
+    def meet(i, j):  # 点 i, j 相遇, 互相从 unmet 中删除
+        for a, b in ((i, j), (j, i)):
+            last = unmet[a].pop()
+            if last != b:
+                unmet[a][unmet_pos[a * v + b]] = last
+                unmet_pos[a * v + last] = unmet_pos[a * v + b]
+            if not unmet[a]:  # a 已出现 (v-1)/2 次
+                last = live.pop()
+                if last != a:
+                    live[live_pos[a]] = last
+                    live_pos[last] = live_pos[a]
 
-        x_matrix[point - 1, pair[0] - 1] = 1
-        x_matrix[pair[0] - 1, point - 1] = 1
-        x_matrix[point - 1, pair[1] - 1] = 1
-        x_matrix[pair[1] - 1, point - 1] = 1
-        x_matrix[pair[0] - 1, pair[1] - 1] = 1
-        x_matrix[pair[1] - 1, pair[0] - 1] = 1
-    else:  # 其余两个数之前出现过，加入这一组，去掉之前的
-        B.append([point, pair[0], pair[1]])
-        for p in B:
-            if (pair[0] in p) and (pair[1] in p):
-                B.remove(p)
-                p.remove(pair[0])
-                p.remove(pair[1])
-                i = int(p[0])
+    def part(i, j):  # 点 i, j 不再相遇
+        block_of[i * v + j] = block_of[j * v + i] = -1
+        for a, b in ((i, j), (j, i)):
+            if not unmet[a]:
+                live_pos[a] = len(live)
+                live.append(a)
+            unmet_pos[a * v + b] = len(unmet[a])
+            unmet[a].append(b)
 
-                live_num[point - 1] += 1
-                live_num[i - 1] -= 1
+    def set_block(k, block):
+        for a, b in ((0, 1), (0, 2), (1, 2)):
+            block_of[block[a] * v + block[b]] = block_of[block[b] * v + block[a]] = k
 
-                x_matrix[point - 1, pair[0] - 1] = 1
-                x_matrix[pair[0] - 1, point - 1] = 1
-                x_matrix[point - 1, pair[1] - 1] = 1
-                x_matrix[pair[1] - 1, point - 1] = 1
+    block_num = 0  # 三元组个数
+    while block_num < (v - 1) * v // 6:
+        # SWITCH
+        point = live[int(rng.random() * len(live))]  # 随机取一个 live 点
+        pair = rng.sample(unmet[point], 2)  # 随机取两个没有相遇过的点组成live_pair
+        k = block_of[pair[0] * v + pair[1]]
+        if k < 0:  # 另外两个数未相遇过，直接添加
+            B.append([point, pair[0], pair[1]])
+            block_num += 1
+            meet(pair[0], pair[1])
+        else:  # 其余两个数之前出现过，加入这一组，去掉之前的
+            old = B[k]
+            i = old[0] + old[1] + old[2] - pair[0] - pair[1]
+            part(i, pair[0])
+            part(i, pair[1])
+            B[k] = [point, pair[0], pair[1]]
+        meet(point, pair[0])
+        meet(point, pair[1])
+        set_block(len(B) - 1 if k < 0 else k, [point, pair[0], pair[1]])
+    return [[p + 1 for p in block] for block in B]
 
-                x_matrix[i - 1, pair[0] - 1] = 0
-                x_matrix[pair[0] - 1, i - 1] = 0
-                x_matrix[i - 1, pair[1] - 1] = 0
-                x_matrix[pair[1] - 1, i - 1] = 0
-                break
-    # bn_list.append(block_num)
-time_end = time.time()
-print('time cost', time_end - time_start, 's')
 
-print(B)
-print(block_num)
-# i = len(bn_list)
-# plt.plot(range(0, i), bn_list)
-# plt.xlabel("steps")
-# plt.ylabel("Block_num")
-# plt.title("v = 43")
-# plt.show()
+if __name__ == '__main__':
+    v = 145
+    time_start = time.time()
+    B = sts_qcd(v)
+    time_end = time.time()
+    print('time cost', time_end - time_start, 's')
+
+    print(B)
+    print(len(B))
@@ -0,0 +1,142 @@
+# Author: Xuechao Zhang
+# Date: October 18th, 2026
+# Description: Integer-indexed hypergraph with O(1) edge updates and a lazy star expansion
+
+from array import array
+import networkx as nx
+
+class Hypergraph():
+    def __init__(self, n, rank=3):
+        '''
+        顶点编号 0..n-1, 超边编号 0,1,2,..., 每条超边最多 rank 个顶点
+        members[e*rank + k]: 超边 e 的第 k 个顶点, -1 为空位
+        incident[x]: 顶点 x 所在的关联位置 e*rank + k 列表, slot[e*rank + k] 为其在列表中的位置, 用于 O(1) 删除
+        删除的超边编号放入 free, 新增超边时优先复用
+        '''
+        self.n = n
+        self.rank = rank
+        self.members = array('i')
+        self.slot = array('i')
+        self.alive = bytearray()
+        self.free = []
+        self.incident = [[] for _ in range(n)]
+        self.edge_num = 0
+        self._star_expansion = None  # 缓存的 networkx 形式, 修改时失效
+
+    @classmethod
+    def from_edges(cls, n, edges, rank=3):
+        H = cls(n, rank)
+        for edge in edges:
+            H.add_edge(edge)
+        return H
+
+    def _place(self, e, vertices):
+        '''
+        把 vertices 写入超边 e 的空位
+        '''
+        if len(vertices) > self.rank:
+            raise ValueError("Edge has more than %d vertices" % self.rank)
+        base = e * self.rank
+        for k, x in enumerate(vertices):
+            self.members[base + k] = x
+            self.slot[base + k] = len(self.incident[x])
+            self.incident[x].append(base + k)
+        self.alive[e] = 1
+        self.edge_num += 1
+        self._star_expansion = None
+
+    def add_edge(self, vertices):
+        '''
+        新增超边, 返回编号, O(rank)
+        '''
+        if self.free:
+            e = self.free.pop()
+        else:
+            e = len(self.alive)
+            self.members.extend([-1] * self.rank)
+            self.slot.extend([-1] * self.rank)
+            self.alive.append(0)
+        self._place(e, vertices)
+        return e
+
+    def _clear(self, e):
+        base = e * self.rank
+        for k in range(self.rank):
+            x = self.members[base + k]
+            if x < 0:
+                break
+            incident = self.incident[x]
+            last = incident.pop()
+            if last != base + k:  # 与末尾交换后删除
+                incident[self.slot[base + k]] = last
+                self.slot[last] = self.slot[base + k]
+            self.members[base + k] = -1
+        self.alive[e] = 0
+        self.edge_num -= 1
+        self._star_expansion = None
+
+    def remove_edge(self, e):
+        '''
+        删除超边 e, O(rank)
+        '''
+        self._clear(e)
+        self.free.append(e)
+
+    def replace_edge(self, e, vertices):
+        '''
+        把超边 e 的顶点替换为 vertices, 编号不变, O(rank)
+        '''
+        self._clear(e)
+        self._place(e, vertices)
+
+    def edge(self, e):
+        '''
+        超边 e 的顶点
+        '''
+        base = e * self.rank
+        return tuple(x for x in self.members[base:base + self.rank] if x >= 0)
+
+    def edges(self):
+        '''
+        遍历所有超边 (编号, 顶点)
+        '''
+        for e, alive in enumerate(self.alive):
+            if alive:
+                yield e, self.edge(e)
+
+    def number_of_edges(self):
+        return self.edge_num
+
+    def incident_edges(self, x):
+        '''
+        顶点 x 所在的超边编号
+        '''
+        return [position // self.rank for position in self.incident[x]]
+
+    def degree(self, x):
+        '''
+        顶点 x 所在的超边数
+        '''
+        return len(self.incident[x])
+
+    def neighbors(self, x):
+        '''
+        与 x 同在某条超边中的顶点 (不含 x)
+        '''
+        neighbors = {y for e in self.incident_edges(x) for y in self.edge(e)}
+        neighbors.discard(x)
+        return neighbors
+
+    def star_expansion(self):
+        '''
+        star expansion 形式的 networkx 图, 仅在画图时生成并缓存
+        顶点 x 对应节点 x, 超边 e 对应节点 n+e, 节点属性 kind 为 "vertex" 或 "edge"
+        '''
+        if self._star_expansion is None:
+            G = nx.Graph()
+            G.add_nodes_from(range(self.n), kind="vertex")
+            for e, vertices in self.edges():
+                G.add_node(self.n + e, kind="edge")
+                G.add_edges_from((self.n + e, x) for x in vertices)
+            self._star_expansion = G
+        return self._star_expansion
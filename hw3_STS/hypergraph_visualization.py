@@ -2,20 +2,31 @@
 # Date: May 9th, 2022
 # Description: 超图可视化, star expansion 形式
 
+import time
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 import random
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.animation import AbstractMovieWriter, FFMpegWriter
+from PIL import Image, GifImagePlugin
+from hypergraph import Hypergraph
 
-def draw_hypergraph(graph, fixed_node=None):
+def draw_hypergraph(hypergraph, fixed_node=None):
     """
-    根据名称"node0""node1""edge0""edge1"区分节点类型, 实现超图可视化
+    超图可视化, star expansion 形式: 顶点 x 为节点 x, 超边 e 为节点 n+e
+    hypergraph: Hypergraph
     fixed_node = (node, pos): 固定部分节点位置 
     """    
-    colors = ["mediumseagreen" if node[:4]=='node' else "grey"
+    graph = hypergraph.star_expansion()
+    n = hypergraph.n
+    colors = ["mediumseagreen" if node < n else "grey"
                         for node in list(graph.nodes)]
-    sizes = [1000 if node[:4]=='node' else 50
+    sizes = [1000 if node < n else 50
                         for node in list(graph.nodes)]
-    label_dict = {node:node[4:] if node[:4]=='node' else ''
+    label_dict = {node:str(node) if node < n else ''
                         for node in list(graph.nodes)}
     if fixed_node:
         (node, pos) = fixed_node
@@ -31,19 +42,114 @@ def draw_hypergraph(graph, fixed_node=None):
     
     return plt
 
+class GifStreamWriter(AbstractMovieWriter):
+    '''
+    逐帧追加写入 GIF, 内存与帧数无关 (PillowWriter 会把所有帧留在内存中, 到 finish 时才写文件)
+    第一帧量化出的调色板作为全局调色板, 之后每帧都映射到同一调色板, 不再带局部调色板
+    '''
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        self.file = open(outfile, "wb")
+        self.palette = None
+
+    def grab_frame(self, **savefig_kwargs):
+        self.fig.set_dpi(self.dpi)
+        self.fig.canvas.draw()
+        image = Image.fromarray(np.asarray(self.fig.canvas.buffer_rgba())[:, :, :3])
+        first = self.palette is None
+        if first:
+            self.palette = image.quantize(colors=64, dither=Image.Dither.NONE)
+        frame = image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        if first:  # 文件头: 全局调色板 + 无限循环
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0, "optimize": False})
+            self.file.write(b"".join(header))
+        self.file.write(b"".join(GifImagePlugin.getdata(frame, duration=1000 / self.fps)))
+
+    def finish(self):
+        self.file.write(b";")  # GIF 结束符
+        self.file.close()
+
+class HypergraphRecorder():
+    def __init__(self, n, path, every_steps=None, every_seconds=None, fps=10, dpi=100):
+        '''
+        离屏录制超图构造过程, 按文件后缀流式写入 GIF (GifStreamWriter) 或 MP4 (ffmpeg 管道)
+        顶点固定在圆周上, 超边画在顶点的重心处并与顶点相连, 不做 spring_layout;
+        每帧只更新同一组 artist 的数据
+        every_steps / every_seconds: 每隔多少步或多少秒 (从上一帧画完起算) 录一帧,
+                                     都不给时默认每秒一帧; 大 v 时每帧要画约 1 秒, 不宜每步录制
+        '''
+        self.n = n
+        self.every_steps = every_steps
+        self.every_seconds = 1.0 if every_steps is None and every_seconds is None else every_seconds
+        angle = 2 * np.pi * np.arange(n) / max(n, 1)
+        self.pos = np.column_stack((np.cos(angle), np.sin(angle)))  # 与 nx.circular_layout 相同的环形分布
+
+        self.fig = Figure(figsize=(6, 6))
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        ax.set_xlim(-1.2, 1.2)
+        ax.set_ylim(-1.2, 1.2)
+        ax.set_aspect("equal")
+        ax.axis("off")
+        self.spokes = LineCollection([], colors="grey", linewidths=0.5, alpha=0.6)
+        ax.add_collection(self.spokes)
+        self.markers = ax.scatter([], [], s=8, c="grey", zorder=2)
+        ax.scatter(self.pos[:, 0], self.pos[:, 1], s=max(20, 3000 // max(n, 1)),
+                   c="mediumseagreen", edgecolors="black", zorder=3)
+        if n <= 50:
+            for i, (x, y) in enumerate(self.pos):
+                ax.text(x * 1.12, y * 1.12, str(i), ha="center", va="center", fontweight="bold")
+        self.title = ax.set_title("")
+
+        writer = FFMpegWriter if str(path).endswith(".mp4") else GifStreamWriter
+        self.writer = writer(fps=fps)
+        self.writer.setup(self.fig, path, dpi=dpi)
+        self.last_step = None
+        self.last_time = time.perf_counter()
+        self.frames = 0
+
+    def due(self, step):
+        '''
+        第 step 步是否需要录一帧
+        '''
+        if self.last_step is None:
+            return True
+        return ((self.every_steps is not None and step - self.last_step >= self.every_steps)
+                or (self.every_seconds is not None and time.perf_counter() - self.last_time >= self.every_seconds))
+
+    def frame(self, step, blocks):
+        '''
+        录制当前的区组 (顶点三元组列表)
+        '''
+        blocks = np.asarray(blocks, dtype=np.int64).reshape(-1, 3)
+        centroids = self.pos[blocks].mean(axis=1)
+        segments = np.stack((np.repeat(centroids, 3, axis=0), self.pos[blocks.ravel()]), axis=1)
+        self.spokes.set_segments(segments)
+        self.markers.set_offsets(centroids)
+        self.title.set_text(f"v = {self.n}, step {step}, {len(blocks)} blocks")
+        self.writer.grab_frame()
+        self.last_step = step
+        self.last_time = time.perf_counter()
+        self.frames += 1
+
+    def close(self, step=None, blocks=None):
+        '''
+        (可选) 录制最后一帧, 然后写完文件
+        '''
+        if blocks is not None and step != self.last_step:
+            self.frame(step, blocks)
+        self.writer.finish()
+
+
 if __name__ == '__main__':
     random.seed(777)
     
-    star_expansion_graph = nx.Graph()               # 转换成 star expansion 形式
     node_num = 6
     edge_num = 5
-    for i in range(node_num):
-        star_expansion_graph.add_node('node'+str(i))
+    hypergraph = Hypergraph(node_num, rank=4)
     for i in range(edge_num):                       # 添加超边
-        star_expansion_graph.add_node('edge'+str(i))
-        for j in random.sample(range(node_num), random.choice([3, 3, 4])): # 连接超边和顶点
-            star_expansion_graph.add_edge('edge'+str(i), 'node'+str(j))
+        hypergraph.add_edge(random.sample(range(node_num), random.choice([3, 3, 4])))
     
     fig, ax = plt.subplots()
-    draw_hypergraph(star_expansion_graph)    
-    plt.show()
\ No newline at end of file
+    draw_hypergraph(hypergraph)    
+    plt.show()
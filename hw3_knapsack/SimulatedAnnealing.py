@@ -15,6 +15,18 @@ def knapsack_problem():
         (98,192),(106,201),(110,210),(113,214),(115,221),(118,229),(120,240)]
     return capacity, weight_profit
 
+def random_knapsack_problem(n, seed=None):
+    """
+    随机生成 n 个物品的问题, 价值与重量正相关, 容量为总重量的一半
+    """
+    rng = random.Random(seed)
+    weight_profit = []
+    for _ in range(n):
+        weight = rng.randint(10, 120)
+        weight_profit.append((weight, weight + rng.randint(0, 60)))
+    capacity = sum(weight for weight, _ in weight_profit) // 2
+    return capacity, weight_profit
+
 def print_table(weight_profit):
     """
     打印表格
@@ -27,12 +39,23 @@ def print_table(weight_profit):
     print(x)
 
 class SimulatedAnnealing:
-    def __init__(self, capacity, weight_profit, temperature = 1000, cooling_rate = 0.995, max_iterations = 1000):
+    def __init__(self, capacity, weight_profit, temperature = 1000, cooling_rate = 0.995, max_iterations = 1000,
+                 engine = "list", print_every = 100):
+        """
+        engine: "list" 原始的列表实现 (默认); "incremental" 以 0-1 数组和累计重量/价值维护解, 每次翻转 O(1)
+        print_every: 每隔多少次迭代打印一次, None 不打印
+        """
         self.capacity = capacity
         self.weight_profit = weight_profit
+        self.weights = [weight for weight, _ in weight_profit]
+        self.profits = [profit for _, profit in weight_profit]
         self.temperature = temperature
         self.cooling_rate = cooling_rate
         self.max_iterations = max_iterations
+        if engine not in ("incremental", "list"):
+            raise ValueError("Unknown engine! engine must be 'incremental' or 'list'.")
+        self.engine = engine
+        self.print_every = print_every
     
     def init_solution(self):
         """
@@ -75,7 +98,26 @@ class SimulatedAnnealing:
             if self.is_valid(neighbor):
                 return neighbor
 
+    def init_selection(self):
+        """
+        随机生成可行解, O(n): 按随机顺序放入物品, 直到放不下为止
+        返回 (0-1 数组, 总重量, 总价值)
+        """
+        selected = bytearray(len(self.weight_profit))
+        weight = profit = 0
+        order = list(range(len(self.weight_profit)))
+        random.shuffle(order)
+        for sample in order:
+            if weight + self.weights[sample] > self.capacity:
+                break
+            selected[sample] = 1
+            weight += self.weights[sample]
+            profit += self.profits[sample]
+        return selected, weight, profit
+
     def solve(self):
+        if self.engine == "incremental":
+            return self.solve_incremental()
         # 初始解
         best_solution = self.init_solution()
         best_solution_value = self.evaluate_solution(best_solution)
@@ -98,13 +140,52 @@ class SimulatedAnnealing:
             if best_solution_value > best_ever:
                 best_ever = best_solution_value
             self.history.append(best_solution_value)
-            if iterations % 100 == 0:
+            if self.print_every and iterations % self.print_every == 0:
                 print("Iterations:", iterations, 
                     "Temperature:", round(self.temperature, 2), 
                     "Best solution value:", best_solution_value,
                     "(Best ever:", best_ever, ")")
         return best_solution, best_solution_value, best_ever
 
+    def solve_incremental(self):
+        """
+        增量实现: 翻转一个物品的可行性与价值变化都是 O(1), 拒绝的移动不修改状态
+        """
+        weights, profits, capacity = self.weights, self.profits, self.capacity
+        n = len(weights)
+        selected, weight, profit = self.init_selection()
+        best_ever = profit
+        self.history = [profit]
+        if not any(w <= capacity for w in weights):  # 没有能放入的物品
+            return [], 0, 0
+
+        for iterations in range(1, self.max_iterations + 1):
+            self.temperature = self.temperature * self.cooling_rate
+
+            # 随机翻转一个物品, 直到可行
+            while True:
+                sample = int(random.random() * n)
+                if selected[sample]:
+                    delta_weight, delta = -weights[sample], -profits[sample]
+                    break
+                if weight + weights[sample] <= capacity:
+                    delta_weight, delta = weights[sample], profits[sample]
+                    break
+            # 以概率性接收
+            if delta > 0 or (self.temperature > 0 and random.random() < math.exp(delta / self.temperature)):
+                selected[sample] ^= 1
+                weight += delta_weight
+                profit += delta
+                if profit > best_ever:
+                    best_ever = profit
+            self.history.append(profit)
+            if self.print_every and iterations % self.print_every == 0:
+                print("Iterations:", iterations, 
+                    "Temperature:", round(self.temperature, 2), 
+                    "Best solution value:", profit,
+                    "(Best ever:", best_ever, ")")
+        return [index for index in range(n) if selected[index]], profit, best_ever
+
     def draw_history(self):
         """
         绘制历史数据